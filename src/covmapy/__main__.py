@@ -0,0 +1,6 @@
+"""Allow running covmapy as ``python -m covmapy``."""
+
+from covmapy.cli import main
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,20 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import click
 
-from covmapy.constants import DefaultValues, SupportedColorscales
-from covmapy.core import CoveragePlotter, PlotlyCoveragePlotter
+from covmapy.constants import DATACLASS_SLOTS, DefaultValues, SupportedColorscales
 from covmapy.models import OutputFormat
 from covmapy.parser import XMLCoverageParser
-from covmapy.plotly_treemap import PlotlyTreemapLayout
+
+if TYPE_CHECKING:
+    from covmapy.core import CoveragePlotter
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class PlotOptions:
     """Configuration options for coverage plot generation."""
 
@@ -20,6 +23,7 @@ class PlotOptions:
     height: int = DefaultValues.HEIGHT
     colorscale: str = DefaultValues.COLORSCALE
     format: str = OutputFormat.HTML.value
+    embed_plotlyjs: bool = DefaultValues.EMBED_PLOTLYJS
 
     def __post_init__(self) -> None:
         """Validate configuration options."""
@@ -29,11 +33,11 @@ class PlotOptions:
         if self.height <= 0:
             msg = "height must be positive"
             raise ValueError(msg)
-        if self.format not in OutputFormat.get_supported_formats():
+        if not OutputFormat.is_supported(self.format):
             supported = ", ".join(f"'{fmt}'" for fmt in OutputFormat.get_supported_formats())
             msg = f"Invalid format: {self.format}. Supported formats: {supported}"
             raise ValueError(msg)
-        if self.colorscale not in SupportedColorscales.SCALES:
+        if self.colorscale not in SupportedColorscales.SCALE_SET:
             msg = f"Invalid colorscale: {self.colorscale}"
             raise ValueError(msg)
 
@@ -47,9 +51,13 @@ def _create_plotter(options: PlotOptions) -> CoveragePlotter:
     Returns:
         Configured coverage plotter instance
     """
+    # Plotly is slow to import, so load it only once a plot is actually requested
+    from covmapy.core import PlotlyCoveragePlotter  # noqa: PLC0415
+    from covmapy.plotly_treemap import PlotlyTreemapLayout  # noqa: PLC0415
+
     parser = XMLCoverageParser()
     layout_engine = PlotlyTreemapLayout(colorscale=options.colorscale)
-    return PlotlyCoveragePlotter(parser, layout_engine)
+    return PlotlyCoveragePlotter(parser, layout_engine, embed_plotlyjs=options.embed_plotlyjs)
 
 
 def _generate_coverage_plot(
@@ -89,6 +97,12 @@ def _generate_coverage_plot(
     type=click.Choice(SupportedColorscales.SCALES),
     help="Plotly colorscale for treemap visualization",
 )
+@click.option(
+    "--embed-plotlyjs",
+    is_flag=True,
+    default=DefaultValues.EMBED_PLOTLYJS,
+    help="Embed plotly.js in the HTML file instead of loading it from the CDN",
+)
 def covmapy(coverage_file: Path, **kwargs: Any) -> None:
     """Generate coverage visualization from XML coverage file.
 
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 
 from covmapy.constants import ColorValues, CoverageThresholds
 
@@ -17,8 +18,70 @@ class ColorMapper(ABC):
             RGB color tuple (r, g, b) with values 0-255
         """
 
+    def get_colors(self, coverage_rates: Iterable[float]) -> list[tuple[int, int, int]]:
+        """Map many coverage rates to RGB colors.
 
-class GradientColorMapper(ColorMapper):
+        Args:
+            coverage_rates: Coverage rates between 0.0 and 1.0
+
+        Returns:
+            RGB color tuples in the same order as the input rates
+        """
+        return [self.get_color(rate) for rate in coverage_rates]
+
+
+class LookupColorMapper(ColorMapper):
+    """Color mapper that serves colors from a table precomputed at construction."""
+
+    def __init__(self) -> None:
+        """Initialize the lookup table from the subclass color function."""
+        super().__init__()
+        self._build_lut()
+
+    def _build_lut(self) -> None:
+        """Compute the lookup table; subclasses call this again when their colors change."""
+        steps = ColorValues.LUT_RESOLUTION
+        self._lut = [self._compute_color(i / steps) for i in range(steps + 1)]
+
+    @abstractmethod
+    def _compute_color(self, rate: float) -> tuple[int, int, int]:
+        """Compute the color for a coverage rate.
+
+        Args:
+            rate: Coverage rate already clamped to [0.0, 1.0]
+
+        Returns:
+            RGB color tuple (r, g, b) with values 0-255
+        """
+
+    def get_color(self, coverage_rate: float) -> tuple[int, int, int]:
+        """Look up the color for a coverage rate.
+
+        Args:
+            coverage_rate: Coverage rate between 0.0 and 1.0
+
+        Returns:
+            RGB color tuple (r, g, b) with values 0-255
+        """
+        # Clamp coverage rate to valid range
+        rate = max(0.0, min(1.0, coverage_rate))
+        return self._lut[round(rate * ColorValues.LUT_RESOLUTION)]
+
+    def get_colors(self, coverage_rates: Iterable[float]) -> list[tuple[int, int, int]]:
+        """Look up colors for many coverage rates in a single pass.
+
+        Args:
+            coverage_rates: Coverage rates between 0.0 and 1.0
+
+        Returns:
+            RGB color tuples in the same order as the input rates
+        """
+        lut = self._lut
+        steps = ColorValues.LUT_RESOLUTION
+        return [lut[round(max(0.0, min(1.0, rate)) * steps)] for rate in coverage_rates]
+
+
+class GradientColorMapper(LookupColorMapper):
     """Maps coverage rate to color using linear interpolation between two colors."""
 
     def __init__(
@@ -32,22 +95,39 @@ class GradientColorMapper(ColorMapper):
             low_color: RGB color for 0% coverage (default: red)
             high_color: RGB color for 100% coverage (default: green)
         """
+        self._low_color = low_color
+        self._high_color = high_color
         super().__init__()
-        self.low_color = low_color
-        self.high_color = high_color
 
-    def get_color(self, coverage_rate: float) -> tuple[int, int, int]:
+    @property
+    def low_color(self) -> tuple[int, int, int]:
+        """RGB color for 0% coverage."""
+        return self._low_color
+
+    @low_color.setter
+    def low_color(self, color: tuple[int, int, int]) -> None:
+        self._low_color = color
+        self._build_lut()
+
+    @property
+    def high_color(self) -> tuple[int, int, int]:
+        """RGB color for 100% coverage."""
+        return self._high_color
+
+    @high_color.setter
+    def high_color(self, color: tuple[int, int, int]) -> None:
+        self._high_color = color
+        self._build_lut()
+
+    def _compute_color(self, rate: float) -> tuple[int, int, int]:
         """Map coverage rate to color using linear interpolation.
 
         Args:
-            coverage_rate: Coverage rate between 0.0 and 1.0
+            rate: Coverage rate between 0.0 and 1.0
 
         Returns:
             RGB color tuple (r, g, b) with values 0-255
         """
-        # Clamp coverage rate to valid range
-        rate = max(0.0, min(1.0, coverage_rate))
-
         # Linear interpolation between low_color and high_color
         r = int(self.low_color[0] + (self.high_color[0] - self.low_color[0]) * rate)
         g = int(self.low_color[1] + (self.high_color[1] - self.low_color[1]) * rate)
@@ -56,7 +136,7 @@ class GradientColorMapper(ColorMapper):
         return (r, g, b)
 
 
-class ThreeStageColorMapper(ColorMapper):
+class ThreeStageColorMapper(LookupColorMapper):
     """Maps coverage rate to color using three-stage gradient as per architecture."""
 
     # Coverage thresholds
@@ -67,7 +147,7 @@ class ThreeStageColorMapper(ColorMapper):
         """Initialize three-stage color mapper."""
         super().__init__()
 
-    def get_color(self, coverage_rate: float) -> tuple[int, int, int]:
+    def _compute_color(self, rate: float) -> tuple[int, int, int]:
         """Map coverage rate to color using three-stage gradient.
 
         Stages:
@@ -76,14 +156,11 @@ class ThreeStageColorMapper(ColorMapper):
         - 70-100%: yellow → green
 
         Args:
-            coverage_rate: Coverage rate between 0.0 and 1.0
+            rate: Coverage rate between 0.0 and 1.0
 
         Returns:
             RGB color tuple (r, g, b) with values 0-255
         """
-        # Clamp coverage rate to valid range
-        rate = max(0.0, min(1.0, coverage_rate))
-
         if rate <= self.LOW_THRESHOLD:
             # Red to orange (0-30%)
             local_rate = rate / self.LOW_THRESHOLD
@@ -1,7 +1,12 @@
 """Constants for coverage plot configuration and visualization."""
 
+import sys
 from typing import Final
 
+# Keyword arguments for @dataclass: tree nodes and other per-item records drop
+# the per-instance __dict__ where supported (Python 3.10+)
+DATACLASS_SLOTS: Final[dict[str, bool]] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class PlotlyConfig:
     """Configuration constants for Plotly treemap visualization."""
@@ -40,6 +45,20 @@ class PlotlyConfig:
     EMPTY_DIRECTORY_VALUE: Final[int] = 1
     EMPTY_DIRECTORY_COLOR: Final[int] = 0
 
+    # HTML output
+    PLOTLYJS_CDN: Final[str] = "cdn"
+    HTML_WRITE_BUFFER_SIZE: Final[int] = 1 << 20
+
+
+class ParserConfig:
+    """Configuration constants for coverage XML parsing."""
+
+    # Number of characters (or bytes) fed to the incremental XML parser at a time
+    FEED_CHUNK_SIZE: Final[int] = 1 << 16
+
+    # Buffer size used when reading coverage files from disk
+    READ_BUFFER_SIZE: Final[int] = 1 << 20
+
 
 class CoverageThresholds:
     """Coverage rate thresholds for color mapping."""
@@ -65,6 +84,9 @@ class ColorValues:
     YELLOW_GREEN_OFFSET: Final[int] = 127
     BLUE_COMPONENT: Final[int] = 0
 
+    # Number of steps in precomputed color lookup tables (rates are snapped to 1/LUT_RESOLUTION)
+    LUT_RESOLUTION: Final[int] = 1000
+
 
 class SupportedColorscales:
     """Supported Plotly colorscales for treemap visualization."""
@@ -80,6 +102,9 @@ class SupportedColorscales:
         "Spectral",
     ]
 
+    # Set view of SCALES for constant-time membership checks
+    SCALE_SET: Final[frozenset[str]] = frozenset(SCALES)
+
     DEFAULT: Final[str] = "Spectral"
 
 
@@ -91,3 +116,4 @@ class DefaultValues:
     HEIGHT: Final[int] = PlotlyConfig.DEFAULT_HEIGHT
     COLORSCALE: Final[str] = SupportedColorscales.DEFAULT
     FORMAT: Final[str] = "html"
+    EMBED_PLOTLYJS: Final[bool] = False
@@ -1,11 +1,16 @@
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol, Union
 
-from covmapy.constants import DefaultValues
+from covmapy.constants import DefaultValues, ParserConfig, PlotlyConfig
 from covmapy.exceptions import UnsupportedFormatError
-from covmapy.models import OutputFormat
-from covmapy.parser import XMLCoverageParser
-from covmapy.plotly_treemap import PlotlyTreemapLayout
+from covmapy.models import HierarchicalCoverageReport, OutputFormat
+from covmapy.parser import CoverageParseError, InvalidXMLError
+
+if TYPE_CHECKING:
+    from covmapy.parser import XMLCoverageParser
+    from covmapy.plotly_treemap import PlotlyTreemapLayout
 
 
 class CoveragePlotter(Protocol):
@@ -57,15 +62,19 @@ class PlotlyCoveragePlotter:
         self,
         parser: XMLCoverageParser,
         layout_engine: PlotlyTreemapLayout,
+        *,
+        embed_plotlyjs: bool = DefaultValues.EMBED_PLOTLYJS,
     ) -> None:
         """Initialize Plotly coverage plotter with dependencies.
 
         Args:
             parser: XML coverage data parser
             layout_engine: Plotly treemap layout engine
+            embed_plotlyjs: Embed plotly.js in HTML output instead of loading it from the CDN
         """
         self.parser = parser
         self.layout_engine = layout_engine
+        self.embed_plotlyjs = embed_plotlyjs
 
     def plot(
         self,
@@ -87,19 +96,7 @@ class PlotlyCoveragePlotter:
         """
         # Parse coverage data into hierarchical structure
         hierarchical_report = self.parser.parse_hierarchical(coverage_xml)
-
-        # Generate Plotly figure
-        figure = self.layout_engine.generate_figure(hierarchical_report, width, height)
-
-        # Save figure
-        try:
-            output_format = OutputFormat(format_.lower())
-            if output_format == OutputFormat.HTML:
-                figure.write_html(output_path)
-            else:
-                raise NotImplementedError(f"Format '{format_}' is not yet implemented")
-        except ValueError as err:
-            raise UnsupportedFormatError(format_, OutputFormat.get_supported_formats()) from err
+        self._render(hierarchical_report, output_path, width=width, height=height, format_=format_)
 
     def plot_from_file(
         self,
@@ -112,12 +109,60 @@ class PlotlyCoveragePlotter:
     ) -> None:
         """Generate Plotly coverage visualization from file.
 
+        The file is streamed into the parser rather than read into memory as a
+        single string.
+
         Args:
             coverage_file: Path to coverage XML file
             output_path: Path to save the output file
             width: Figure width in pixels
             height: Figure height in pixels
-            format: Output format (only 'html' is supported)
+            format_: Output format (only 'html' is supported)
+
+        Raises:
+            CoverageParseError: If the file is not valid coverage XML
         """
-        coverage_xml = coverage_file.read_text(encoding="utf-8")
-        self.plot(coverage_xml, output_path, width=width, height=height, format_=format_)
+        with coverage_file.open("rb", buffering=ParserConfig.READ_BUFFER_SIZE) as coverage_stream:
+            try:
+                hierarchical_report = self.parser.parse_hierarchical_stream(coverage_stream)
+            except InvalidXMLError as e:
+                # Name the file and keep the XML parser's message, which points at the offending position
+                reason = f"{e.reason}: {e.__cause__}" if e.__cause__ is not None else e.reason
+                raise CoverageParseError(str(coverage_file), reason) from e
+        self._render(hierarchical_report, output_path, width=width, height=height, format_=format_)
+
+    def _render(
+        self,
+        hierarchical_report: HierarchicalCoverageReport,
+        output_path: str,
+        *,
+        width: int,
+        height: int,
+        format_: str,
+    ) -> None:
+        """Generate the figure for a parsed report and save it.
+
+        Args:
+            hierarchical_report: Parsed hierarchical coverage report
+            output_path: Path to save the output file
+            width: Figure width in pixels
+            height: Figure height in pixels
+            format_: Output format (only 'html' is supported)
+        """
+        # Generate Plotly figure
+        figure = self.layout_engine.generate_figure(hierarchical_report, width, height)
+
+        # Save figure
+        try:
+            output_format = OutputFormat(format_.lower())
+        except ValueError as err:
+            raise UnsupportedFormatError(format_, OutputFormat.get_supported_formats()) from err
+
+        if output_format == OutputFormat.HTML:
+            # Stream the HTML through a large buffer; loading plotly.js from the CDN keeps the file small
+            include_plotlyjs: Union[bool, str] = True if self.embed_plotlyjs else PlotlyConfig.PLOTLYJS_CDN
+            buffer_size = PlotlyConfig.HTML_WRITE_BUFFER_SIZE
+            with Path(output_path).open("w", encoding="utf-8", buffering=buffer_size) as html_file:
+                figure.write_html(html_file, include_plotlyjs=include_plotlyjs)
+        else:
+            raise NotImplementedError(f"Format '{format_}' is not yet implemented")
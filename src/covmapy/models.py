@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, Union
+from typing import Optional, Union, cast
+
+from covmapy.constants import DATACLASS_SLOTS
 
 
 class OutputFormat(Enum):
@@ -13,10 +15,20 @@ class OutputFormat(Enum):
     @classmethod
     def get_supported_formats(cls) -> list[str]:
         """Get list of supported format strings."""
-        return [fmt.value for fmt in cls]
+        return list(_SUPPORTED_FORMATS)
+
+    @classmethod
+    def is_supported(cls, format_: str) -> bool:
+        """Check whether a format string names a supported output format."""
+        return format_ in _SUPPORTED_FORMAT_SET
 
 
-@dataclass
+# Enum iteration is comparatively slow, so the format values are computed once at import
+_SUPPORTED_FORMATS: tuple[str, ...] = tuple(fmt.value for fmt in OutputFormat)
+_SUPPORTED_FORMAT_SET: frozenset[str] = frozenset(_SUPPORTED_FORMATS)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class FileCoverage:
     """Represents coverage data for a single file."""
 
@@ -30,59 +42,118 @@ class FileCoverage:
         return self.covered_lines / self.total_lines if self.total_lines > 0 else 0.0
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class CoverageReport:
     """Represents coverage data for multiple files."""
 
     files: list[FileCoverage]
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DirectoryNode:
-    """Represents a directory node in the hierarchical coverage tree."""
+    """Represents a directory node in the hierarchical coverage tree.
+
+    Line totals are cached per directory. Add children through the constructor
+    or ``add_child``, which keep ``parent`` links and the caches of all
+    ancestors up to date. Appending to ``children`` directly is only noticed by
+    that directory itself, not by its ancestors.
+    """
 
     name: str
     path: str
     children: list[Union[DirectoryNode, FileNode]]
-    parent: Optional[DirectoryNode] = None
+    parent: Optional[DirectoryNode] = field(default=None, compare=False, repr=False)
+    # Cached (child count, total_lines, covered_lines); cleared by add_child on this node and its ancestors
+    _line_totals: Optional[tuple[int, int, int]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        for child in self.children:
+            child.parent = self
 
     @property
     def total_lines(self) -> int:
         """Calculate total lines in this directory and all subdirectories."""
-        total = 0
-        for child in self.children:
-            total += child.total_lines
-        return total
+        return self._get_line_totals()[0]
 
     @property
     def covered_lines(self) -> int:
         """Calculate covered lines in this directory and all subdirectories."""
-        total = 0
-        for child in self.children:
-            total += child.covered_lines
-        return total
+        return self._get_line_totals()[1]
 
     @property
     def coverage_rate(self) -> float:
         """Calculate coverage rate for this directory."""
-        if self.total_lines == 0:
+        total_lines, covered_lines = self._get_line_totals()
+        if total_lines == 0:
             return 0.0
-        return self.covered_lines / self.total_lines
+        return covered_lines / total_lines
 
     def add_child(self, child: Union[DirectoryNode, FileNode]) -> None:
         """Add a child node to this directory."""
         child.parent = self
         self.children.append(child)
-
-
-@dataclass
+        self._invalidate_line_totals()
+
+    def _has_line_totals(self) -> bool:
+        """Check whether the cached line totals still match the children."""
+        cached = self._line_totals
+        return cached is not None and cached[0] == len(self.children)
+
+    def _get_line_totals(self) -> tuple[int, int]:
+        """Sum line counts over all children, computing them at most once.
+
+        Uncached subdirectories are aggregated in an explicit post-order walk,
+        so deep trees cannot hit the interpreter recursion limit.
+        """
+        if self._has_line_totals():
+            _, total, covered = cast("tuple[int, int, int]", self._line_totals)
+            return total, covered
+
+        totals = (0, 0)
+        stack: list[tuple[DirectoryNode, bool]] = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                # Revisit this node once all of its uncached subdirectories are done
+                stack.append((node, True))
+                stack.extend(
+                    (child, False)
+                    for child in node.children
+                    if isinstance(child, DirectoryNode) and not child._has_line_totals()
+                )
+                continue
+
+            total = 0
+            covered = 0
+            for child in node.children:
+                if isinstance(child, DirectoryNode):
+                    child_total, child_covered = child._get_line_totals()
+                else:
+                    child_total, child_covered = child.total_lines, child.covered_lines
+                total += child_total
+                covered += child_covered
+            totals = (total, covered)
+            node._line_totals = (len(node.children), total, covered)
+
+        # This directory is finished last, so totals holds its own sums
+        return totals
+
+    def _invalidate_line_totals(self) -> None:
+        """Drop cached line totals for this directory and all ancestors."""
+        node: Optional[DirectoryNode] = self
+        while node is not None and node._line_totals is not None:
+            node._line_totals = None
+            node = node.parent
+
+
+@dataclass(**DATACLASS_SLOTS)
 class FileNode:
     """Represents a file node in the hierarchical coverage tree."""
 
     name: str
     path: str
     file_coverage: FileCoverage
-    parent: Optional[DirectoryNode] = None
+    parent: Optional[DirectoryNode] = field(default=None, compare=False, repr=False)
 
     @property
     def total_lines(self) -> int:
@@ -100,7 +171,7 @@ class FileNode:
         return self.file_coverage.coverage_rate
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class HierarchicalCoverageReport:
     """Represents hierarchical coverage data with directory structure."""
 
@@ -1,7 +1,12 @@
+from __future__ import annotations
+
+import os
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
-from pathlib import Path
+from functools import partial
+from typing import TYPE_CHECKING, BinaryIO, Optional, Union
 
+from covmapy.constants import ParserConfig
 from covmapy.models import (
     CoverageReport,
     DirectoryNode,
@@ -10,6 +15,10 @@ from covmapy.models import (
     HierarchicalCoverageReport,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
 
 class CoverageParseError(Exception):
     """Raised when coverage data cannot be parsed."""
@@ -45,6 +54,58 @@ class CoverageParser(ABC):
         """
 
 
+# Final path components that normalization would rewrite, so they cannot be
+# filed under their raw directory prefix
+_NON_FILE_NAMES: frozenset[str] = frozenset(("", os.curdir, os.pardir))
+
+
+class _ClassCoverageTarget:
+    """XML parser target that counts line hits per ``<class>`` element.
+
+    The parser calls ``start``/``end`` for every element, so no tree is built.
+    Completed entries collect in ``files`` for the caller to drain.
+    """
+
+    def __init__(self) -> None:
+        self.files: list[FileCoverage] = []
+        self._filename: Optional[str] = None
+        self._in_class = False
+        self._total_lines = 0
+        self._covered_lines = 0
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        """Count a line or begin a new class element."""
+        if tag == "line":
+            if self._in_class:
+                self._total_lines += 1
+                # coverage.py writes hit counts as plain integers, so anything
+                # other than "0" is a covered line
+                if attrib.get("hits", "0") != "0":
+                    self._covered_lines += 1
+        elif tag == "class":
+            self._in_class = True
+            self._filename = attrib.get("filename")
+            self._total_lines = 0
+            self._covered_lines = 0
+
+    def end(self, tag: str) -> None:
+        """Record the coverage of a finished class element."""
+        if tag != "class":
+            return
+        self._in_class = False
+        if self._filename and self._total_lines > 0:
+            self.files.append(
+                FileCoverage(
+                    filename=self._filename,
+                    total_lines=self._total_lines,
+                    covered_lines=self._covered_lines,
+                )
+            )
+
+    def close(self) -> None:
+        """Finish parsing; entries are read from ``files``."""
+
+
 class XMLCoverageParser(CoverageParser):
     """Parser for coverage.xml format."""
 
@@ -60,38 +121,78 @@ class XMLCoverageParser(CoverageParser):
         Raises:
             CoverageParseError: If XML parsing fails or format is invalid
         """
-        try:
-            root = ET.fromstring(content)  # noqa: S314
-        except ET.ParseError as e:
-            raise InvalidXMLError from e
+        return CoverageReport(files=list(self._iter_file_coverages(self._text_chunks(content))))
 
-        files: list[FileCoverage] = []
+    def parse_stream(self, source: BinaryIO) -> CoverageReport:
+        """Parse coverage data from a binary stream.
 
-        # Find all class elements (representing files)
-        for class_elem in root.findall(".//class"):
-            filename = class_elem.get("filename")
-            if not filename:
-                continue
+        The raw bytes are handed to the XML parser without decoding them to a
+        string first, so the XML declaration decides the encoding.
 
-            # Count lines and hits
-            total_lines = 0
-            covered_lines = 0
-
-            for line_elem in class_elem.findall(".//line"):
-                total_lines += 1
-                hits = line_elem.get("hits", "0")
-                if int(hits) > 0:
-                    covered_lines += 1
-
-            if total_lines > 0:
-                file_coverage = FileCoverage(
-                    filename=filename,
-                    total_lines=total_lines,
-                    covered_lines=covered_lines,
-                )
-                files.append(file_coverage)
+        Args:
+            source: Binary file object positioned at the start of the XML data
+
+        Returns:
+            Parsed coverage report containing file coverage data
+
+        Raises:
+            CoverageParseError: If XML parsing fails or format is invalid
+        """
+        return CoverageReport(files=list(self._iter_file_coverages(self._stream_chunks(source))))
+
+    def _text_chunks(self, content: str) -> Iterator[str]:
+        """Split XML content into parser feed chunks.
+
+        Args:
+            content: XML coverage data as string
+
+        Yields:
+            Consecutive slices of the content
+        """
+        chunk_size = ParserConfig.FEED_CHUNK_SIZE
+        for start in range(0, len(content), chunk_size):
+            yield content[start : start + chunk_size]
+
+    def _stream_chunks(self, source: BinaryIO) -> Iterator[bytes]:
+        """Read parser feed chunks from a binary stream.
+
+        Args:
+            source: Binary file object to read from
+
+        Returns:
+            Iterator over consecutive blocks of the stream
+        """
+        return iter(partial(source.read, ParserConfig.FEED_CHUNK_SIZE), b"")
+
+    def _iter_file_coverages(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[FileCoverage]:
+        """Stream file coverage entries out of XML content.
 
-        return CoverageReport(files=files)
+        The chunks are fed to a parser whose target counts lines as their start
+        tags arrive, so no element tree is built and memory stays bounded by
+        the coverage entries themselves.
+
+        Args:
+            chunks: Consecutive pieces of the XML document
+
+        Yields:
+            Coverage data for each class element that has a filename and lines
+
+        Raises:
+            InvalidXMLError: If the XML content is malformed
+        """
+        target = _ClassCoverageTarget()
+        # The report is a local file the user chose to plot, and expat does not expand external entities
+        xml_parser = ET.XMLParser(target=target)  # noqa: S314
+        files = target.files
+        try:
+            for chunk in chunks:
+                xml_parser.feed(chunk)
+                yield from files
+                files.clear()
+            xml_parser.close()
+        except ET.ParseError as e:
+            raise InvalidXMLError from e
+        yield from files
 
     def parse_hierarchical(self, content: str) -> HierarchicalCoverageReport:
         """Parse coverage data into hierarchical structure.
@@ -105,131 +206,129 @@ class XMLCoverageParser(CoverageParser):
         Raises:
             CoverageParseError: If XML parsing fails or format is invalid
         """
-        # First parse flat structure
-        flat_report = self.parse(content)
-
-        # Build hierarchical structure
-        return self._build_hierarchy(flat_report)
+        return self._build_hierarchy(self._iter_file_coverages(self._text_chunks(content)))
 
-    def _build_hierarchy(self, report: CoverageReport) -> HierarchicalCoverageReport:
-        """Build hierarchical directory structure from flat file list.
+    def parse_hierarchical_stream(self, source: BinaryIO) -> HierarchicalCoverageReport:
+        """Parse coverage data from a binary stream into hierarchical structure.
 
         Args:
-            report: Flat coverage report
+            source: Binary file object positioned at the start of the XML data
 
         Returns:
-            Hierarchical coverage report with directory tree
-        """
-        if not report.files:
-            root = DirectoryNode(name="", path="", children=[])
-            return HierarchicalCoverageReport(root=root)
-
-        # Find common root path
-        common_root = self._find_common_root([f.filename for f in report.files])
-
-        # Create root directory
-        root = DirectoryNode(
-            name=Path(common_root).name if common_root else "root",
-            path=common_root,
-            children=[],
-        )
-
-        # Build directory tree
-        directory_map: dict[str, DirectoryNode] = {common_root: root}
+            Parsed hierarchical coverage report with directory structure
 
-        for file_coverage in report.files:
-            self._add_file_to_tree(file_coverage, root, directory_map, common_root)
+        Raises:
+            CoverageParseError: If XML parsing fails or format is invalid
+        """
+        return self._build_hierarchy(self._iter_file_coverages(self._stream_chunks(source)))
 
-        return HierarchicalCoverageReport(root=root)
+    def _build_hierarchy(self, file_coverages: Iterable[FileCoverage]) -> HierarchicalCoverageReport:
+        """Build hierarchical directory structure in a single pass over the files.
 
-    def _find_common_root(self, filepaths: list[str]) -> str:
-        """Find common root path for all files.
+        Each file is inserted under an anonymous top node as it arrives, so no
+        flat file list has to be collected first. The common root is found
+        afterwards by descending through directories that are the only child
+        of their parent.
 
         Args:
-            filepaths: List of file paths
+            file_coverages: File coverage entries, typically streamed from the parser
 
         Returns:
-            Common root path string
+            Hierarchical coverage report with directory tree
         """
-        if not filepaths:
-            return ""
+        top = DirectoryNode(name="", path="", children=[])
+        directory_map: dict[tuple[str, ...], DirectoryNode] = {(): top}
+        # Directory of each raw filename prefix already seen; files in a known
+        # directory skip path normalization and the per-component walk
+        directory_cache: dict[str, DirectoryNode] = {}
+
+        for file_coverage in file_coverages:
+            head, name = os.path.split(file_coverage.filename)
+            directory = directory_cache.get(head) if name not in _NON_FILE_NAMES else None
+            if directory is not None:
+                directory.add_child(FileNode(name=name, path=file_coverage.filename, file_coverage=file_coverage))
+                continue
+
+            directory = self._add_file_to_tree(file_coverage, top, directory_map)
+            if name not in _NON_FILE_NAMES:
+                directory_cache[head] = directory
 
-        if len(filepaths) == 1:
-            return str(Path(filepaths[0]).parent)
+        if not top.children:
+            return HierarchicalCoverageReport(root=top)
 
-        # Convert to Path objects and find common parts
-        paths = [Path(fp) for fp in filepaths]
-        common_parts = []
+        # Collapse the chain of directories shared by every file into the root
+        root = top
+        while len(root.children) == 1 and isinstance(root.children[0], DirectoryNode):
+            root = root.children[0]
+        root.parent = None
+        root.name = root.path.rpartition(os.sep)[2] if root is not top else "root"
 
-        # Find minimum number of parts
-        min_parts = min(len(p.parts) for p in paths)
+        return HierarchicalCoverageReport(root=root)
 
-        for i in range(min_parts):
-            # Get the i-th part from all paths
-            parts_at_i = [p.parts[i] for p in paths]
+    def _split_path(self, filename: str) -> list[str]:
+        """Split a file path into its components.
 
-            # Check if all parts are the same
-            if all(part == parts_at_i[0] for part in parts_at_i):
-                common_parts.append(parts_at_i[0])
-            else:
-                break
+        An absolute path keeps its anchor (e.g. ``/`` or ``C:\\``) as the first
+        component so that joining the components restores the path.
 
-        if not common_parts:
-            return ""
+        Args:
+            filename: File path as reported in the coverage XML
 
-        return str(Path(*common_parts))
+        Returns:
+            Path components, ending with the file name
+        """
+        drive, rest = os.path.splitdrive(os.path.normpath(filename))
+        anchor = drive
+        if rest.startswith(os.sep):
+            anchor += os.sep
+            rest = rest.lstrip(os.sep)
+        parts = rest.split(os.sep)  # noqa: PTH206
+        return [anchor, *parts] if anchor else parts
 
     def _add_file_to_tree(
         self,
         file_coverage: FileCoverage,
         root: DirectoryNode,
-        directory_map: dict[str, DirectoryNode],
-        common_root: str,
-    ) -> None:
+        directory_map: dict[tuple[str, ...], DirectoryNode],
+    ) -> DirectoryNode:
         """Add a file to the directory tree.
 
         Args:
             file_coverage: File coverage data
             root: Root directory node
-            directory_map: Map of directory paths to nodes
-            common_root: Common root path
+            directory_map: Map of directory path components to nodes
+
+        Returns:
+            Directory node the file was added to
         """
-        file_path = Path(file_coverage.filename)
-
-        # Remove common root from file path
-        if common_root:
-            try:
-                relative_path = file_path.relative_to(common_root)
-            except ValueError:
-                # If file is not under common root, use absolute path
-                relative_path = file_path
-        else:
-            relative_path = file_path
+        parts = self._split_path(file_coverage.filename)
 
         # Create directory structure
         current_dir = root
-        current_path = common_root
+        key: tuple[str, ...] = ()
 
         # Process each directory component
-        for _i, part in enumerate(relative_path.parts[:-1]):  # Exclude filename
-            dir_path = str(Path(current_path) / part) if current_path else part
+        for part in parts[:-1]:  # Exclude filename
+            key = (*key, part)
+            directory = directory_map.get(key)
 
-            if dir_path not in directory_map:
-                # Create new directory node
-                new_dir = DirectoryNode(name=part, path=dir_path, children=[])
-                current_dir.add_child(new_dir)
-                directory_map[dir_path] = new_dir
+            if directory is None:
+                # Create new directory node; the path string is only built here
+                dir_path = os.path.join(current_dir.path, part) if current_dir.path else part  # noqa: PTH118
+                directory = DirectoryNode(name=part, path=dir_path, children=[])
+                current_dir.add_child(directory)
+                directory_map[key] = directory
 
-            current_dir = directory_map[dir_path]
-            current_path = dir_path
+            current_dir = directory
 
         # Add file node
         file_node = FileNode(
-            name=relative_path.name,
+            name=parts[-1],
             path=file_coverage.filename,
             file_coverage=file_coverage,
         )
         current_dir.add_child(file_node)
+        return current_dir
 
 
 def parse_coverage_file(file_path: Path) -> CoverageReport:
@@ -250,8 +349,8 @@ def parse_coverage_file(file_path: Path) -> CoverageReport:
         raise FileNotFoundError(msg)
 
     try:
-        content = file_path.read_text(encoding="utf-8")
-        parser = XMLCoverageParser()
-        return parser.parse(content)
-    except UnicodeDecodeError as e:
-        raise CoverageParseError(str(file_path), str(e)) from e
+        with file_path.open("rb", buffering=ParserConfig.READ_BUFFER_SIZE) as coverage_stream:
+            parser = XMLCoverageParser()
+            return parser.parse_stream(coverage_stream)
+    except InvalidXMLError as e:
+        raise CoverageParseError(str(file_path), e.reason) from e
@@ -2,14 +2,35 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Union
+from dataclasses import dataclass, field
+from typing import Any, Final, Union
 
 import plotly.graph_objects as go  # type: ignore[import-untyped]
 
-from covmapy.constants import DefaultValues, PlotlyConfig
+from covmapy.constants import DATACLASS_SLOTS, DefaultValues, PlotlyConfig
 from covmapy.models import DirectoryNode, FileNode, HierarchicalCoverageReport
 
+# Figure settings fixed by PlotlyConfig, built once; Plotly copies these dicts and never mutates them
+_TILING: Final[dict[str, Any]] = {
+    "packing": PlotlyConfig.TILING_PACKING,
+    "squarifyratio": PlotlyConfig.GOLDEN_RATIO,
+    "pad": PlotlyConfig.TILING_PADDING,
+}
+_COLORBAR: Final[dict[str, Any]] = {"title": {"text": "Coverage %"}}
+_MARKER_LINE: Final[dict[str, Any]] = {"width": PlotlyConfig.BORDER_WIDTH, "color": PlotlyConfig.BORDER_COLOR}
+_TITLE: Final[dict[str, Any]] = {
+    "text": PlotlyConfig.DEFAULT_TITLE,
+    "x": PlotlyConfig.TITLE_X_POSITION,
+    "xanchor": PlotlyConfig.TITLE_X_ANCHOR,
+}
+_MARGIN: Final[dict[str, Any]] = {
+    "t": PlotlyConfig.MARGIN_TOP,
+    "b": PlotlyConfig.MARGIN_BOTTOM,
+    "l": PlotlyConfig.MARGIN_LEFT,
+    "r": PlotlyConfig.MARGIN_RIGHT,
+}
+_FONT: Final[dict[str, Any]] = {"size": PlotlyConfig.FONT_SIZE}
+
 
 class PlotlyTreemapLayout:
     """Hierarchical treemap layout using Plotly."""
@@ -41,56 +62,48 @@ class PlotlyTreemapLayout:
         # Prepare hierarchical data for Plotly treemap
         treemap_data = self._prepare_treemap_data(hierarchical_report)
 
-        # Use squarify algorithm with golden ratio for optimal space utilization
-
-        # Create hierarchical treemap
-        fig = go.Figure(
-            go.Treemap(
-                ids=treemap_data.ids,
-                labels=treemap_data.labels,
-                values=treemap_data.values,
-                parents=treemap_data.parents,
-                branchvalues="total",
-                textinfo="label",
-                hovertemplate="%{text}<extra></extra>",
-                text=treemap_data.text_info,
-                tiling={
-                    "packing": PlotlyConfig.TILING_PACKING,
-                    "squarifyratio": PlotlyConfig.GOLDEN_RATIO,
-                    "pad": PlotlyConfig.TILING_PADDING,
-                },
-                marker={
-                    "colorscale": self.colorscale,
-                    "colorbar": {"title": "Coverage %"},
-                    "cmid": PlotlyConfig.COVERAGE_MID,
-                    "cmin": PlotlyConfig.COVERAGE_MIN,
-                    "cmax": PlotlyConfig.COVERAGE_MAX,
-                    "line": {"width": PlotlyConfig.BORDER_WIDTH, "color": PlotlyConfig.BORDER_COLOR},
-                    "colors": treemap_data.colors,
-                },
-            )
-        )
-
-        # Update layout
-        fig.update_layout(
-            title={
-                "text": PlotlyConfig.DEFAULT_TITLE,
-                "x": PlotlyConfig.TITLE_X_POSITION,
-                "xanchor": PlotlyConfig.TITLE_X_ANCHOR,
-            },
-            width=width,
-            height=height,
-            margin={
-                "t": PlotlyConfig.MARGIN_TOP,
-                "b": PlotlyConfig.MARGIN_BOTTOM,
-                "l": PlotlyConfig.MARGIN_LEFT,
-                "r": PlotlyConfig.MARGIN_RIGHT,
+        # Resolve the colorscale name through Plotly's validator, as unvalidated
+        # figures would pass it to plotly.js unchanged
+        colorscale = go.treemap.Marker(colorscale=self.colorscale).colorscale
+
+        # Create hierarchical treemap. The trace is built here from TreemapData and
+        # fixed settings, so Plotly's per-element validation (which dominates figure
+        # construction for large reports) is skipped.
+        return go.Figure(
+            data=[
+                {
+                    "type": "treemap",
+                    "ids": treemap_data.ids,
+                    "labels": treemap_data.labels,
+                    "values": treemap_data.values,
+                    "parents": treemap_data.parents,
+                    "branchvalues": "total",
+                    "textinfo": "label",
+                    "hovertemplate": "%{text}<extra></extra>",
+                    "text": treemap_data.text_info,
+                    # Use squarify algorithm with golden ratio for optimal space utilization
+                    "tiling": _TILING,
+                    "marker": {
+                        "colorscale": colorscale,
+                        "colorbar": _COLORBAR,
+                        "cmid": PlotlyConfig.COVERAGE_MID,
+                        "cmin": PlotlyConfig.COVERAGE_MIN,
+                        "cmax": PlotlyConfig.COVERAGE_MAX,
+                        "line": _MARKER_LINE,
+                        "colors": treemap_data.colors,
+                    },
+                }
+            ],
+            layout={
+                "title": _TITLE,
+                "width": width,
+                "height": height,
+                "margin": _MARGIN,
+                "font": _FONT,
             },
-            font={"size": PlotlyConfig.FONT_SIZE},
+            _validate=False,
         )
 
-        return fig
-
     def _prepare_treemap_data(self, hierarchical_report: HierarchicalCoverageReport) -> TreemapData:
         """Prepare data for treemap visualization.
 
@@ -109,73 +122,90 @@ class PlotlyTreemapLayout:
         node: Union[DirectoryNode, FileNode],
         data: TreemapData,
         parent_id: str = "",
-        path_parts: Union[list[str], None] = None,
+        parent_path: str = "",
     ) -> None:
-        """Recursively add nodes to the treemap data.
+        """Add a node and all of its descendants to the treemap data.
+
+        The subtree is walked depth-first with an explicit stack, so deep trees
+        do not consume Python stack frames. Each node's ID is its parent's path
+        string extended by the node name with a single concatenation, and a
+        top-level "root" node is left out of its descendants' IDs.
 
         Args:
             node: Node to add (DirectoryNode or FileNode)
             data: TreemapData to populate
             parent_id: Parent node ID
-            path_parts: Current path parts for building unique IDs
+            parent_path: Joined ID path above the node, used to build unique IDs
         """
-        if path_parts is None:
-            path_parts = []
-
-        node_name = node.name
+        stack: list[tuple[Union[DirectoryNode, FileNode], str, str]]
+        if not parent_path and node.name == "root" and isinstance(node, DirectoryNode):
+            # Decide once that the synthetic root is left out of every descendant ID
+            data.ids.append("root")
+            data.labels.append("root")
+            data.parents.append(parent_id)
+            self._append_directory_row(node, data)
+            stack = [(child, "root", child.name) for child in reversed(node.children)]
+        else:
+            stack = [(node, parent_id, parent_path + "/" + node.name if parent_path else node.name)]
+
+        while stack:
+            current, current_parent_id, unique_id = stack.pop()
+            node_name = current.name
+
+            data.ids.append(unique_id)
+            data.labels.append(node_name)
+            data.parents.append(current_parent_id)
+
+            if isinstance(current, FileNode):
+                # Read the counts once; each property access is a Python-level call
+                file_coverage = current.file_coverage
+                total_lines = file_coverage.total_lines
+                covered_lines = file_coverage.covered_lines
+                coverage_percentage = file_coverage.coverage_rate * 100
+                data.values.append(total_lines)
+                data.colors.append(coverage_percentage)
+                data.text_info.append(
+                    f"{node_name}<br>Coverage: {coverage_percentage:.1f}%<br>Lines: {covered_lines}/{total_lines}"
+                )
+            elif isinstance(current, DirectoryNode):
+                self._append_directory_row(current, data)
 
-        # Create unique ID using full path
-        current_path = [*path_parts, node_name]
-        unique_id = "/".join(current_path) if current_path[0] != "root" else "/".join(current_path[1:]) or "root"
+                # Push children in reverse so they are visited in their original order
+                prefix = unique_id + "/"
+                stack.extend((child, unique_id, prefix + child.name) for child in reversed(current.children))
 
-        data.ids.append(unique_id)
-        data.labels.append(node_name)
-        data.parents.append(parent_id)
+    def _append_directory_row(self, directory: DirectoryNode, data: TreemapData) -> None:
+        """Append the value, color and hover text of a directory to the treemap data.
 
-        if isinstance(node, FileNode):
-            data.values.append(node.total_lines)
-            coverage_percentage = node.coverage_rate * 100
+        Args:
+            directory: Directory whose row is being added
+            data: TreemapData to populate
+        """
+        total_lines = directory.total_lines
+        if total_lines > 0:
+            covered_lines = directory.covered_lines
+            coverage_percentage = covered_lines / total_lines * 100
+            data.values.append(total_lines)
             data.colors.append(coverage_percentage)
             data.text_info.append(
-                f"{node_name}<br>Coverage: {coverage_percentage:.1f}%<br>Lines: {node.covered_lines}/{node.total_lines}"
+                f"{directory.name}<br>"
+                f"Directory<br>"
+                f"Coverage: {coverage_percentage:.1f}%<br>"
+                f"Lines: {covered_lines}/{total_lines}"
             )
-        elif isinstance(node, DirectoryNode):
-            if node.total_lines > 0:
-                data.values.append(node.total_lines)
-                coverage_percentage = node.coverage_rate * 100
-                data.colors.append(coverage_percentage)
-                data.text_info.append(
-                    f"{node_name}<br>"
-                    f"Directory<br>"
-                    f"Coverage: {coverage_percentage:.1f}%<br>"
-                    f"Lines: {node.covered_lines}/{node.total_lines}"
-                )
-            else:
-                data.values.append(PlotlyConfig.EMPTY_DIRECTORY_VALUE)
-                data.colors.append(PlotlyConfig.EMPTY_DIRECTORY_COLOR)
-                data.text_info.append(f"{node_name}<br>Directory")
-
-            # Add children
-            for child in node.children:
-                self._add_node(child, data, unique_id, current_path)
+        else:
+            data.values.append(PlotlyConfig.EMPTY_DIRECTORY_VALUE)
+            data.colors.append(PlotlyConfig.EMPTY_DIRECTORY_COLOR)
+            data.text_info.append(f"{directory.name}<br>Directory")
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TreemapData:
     """Container for treemap visualization data."""
 
-    ids: list[str]
-    labels: list[str]
-    values: list[float]
-    parents: list[str]
-    colors: list[float]
-    text_info: list[str]
-
-    def __init__(self) -> None:
-        """Initialize empty treemap data."""
-        self.ids = []
-        self.labels = []
-        self.values = []
-        self.parents = []
-        self.colors = []
-        self.text_info = []
+    ids: list[str] = field(default_factory=list)
+    labels: list[str] = field(default_factory=list)
+    values: list[float] = field(default_factory=list)
+    parents: list[str] = field(default_factory=list)
+    colors: list[float] = field(default_factory=list)
+    text_info: list[str] = field(default_factory=list)
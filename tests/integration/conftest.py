@@ -0,0 +1,105 @@
+"""Shared fixtures for integration tests."""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+import pytest
+
+import covmapy as covmapy_package
+from covmapy.parser import XMLCoverageParser
+
+if TYPE_CHECKING:
+    from covmapy.models import HierarchicalCoverageReport
+
+CovmapyRunner = Callable[..., "subprocess.CompletedProcess[str]"]
+
+SAMPLE_COVERAGE_XML = """<?xml version="1.0"?>
+<coverage version="7.3.2" timestamp="1701234567890" lines-valid="100" lines-covered="80" line-rate="0.8" branches-valid="20" branches-covered="15" branch-rate="0.75" complexity="0">
+    <sources>
+        <source>.</source>
+    </sources>
+    <packages>
+        <package name="src.covmapy" line-rate="0.8" branch-rate="0.75" complexity="0">
+            <classes>
+                <class name="src/covmapy/cli.py" filename="src/covmapy/cli.py" line-rate="0.9" branch-rate="0.8" complexity="0">
+                    <methods/>
+                    <lines>
+                        <line number="1" hits="1"/>
+                        <line number="2" hits="1"/>
+                        <line number="3" hits="1"/>
+                        <line number="4" hits="1"/>
+                        <line number="5" hits="1"/>
+                        <line number="6" hits="0"/>
+                        <line number="7" hits="1"/>
+                        <line number="8" hits="1"/>
+                        <line number="9" hits="1"/>
+                        <line number="10" hits="1"/>
+                    </lines>
+                </class>
+                <class name="src/covmapy/core.py" filename="src/covmapy/core.py" line-rate="0.7" branch-rate="0.7" complexity="0">
+                    <methods/>
+                    <lines>
+                        <line number="1" hits="1"/>
+                        <line number="2" hits="1"/>
+                        <line number="3" hits="1"/>
+                        <line number="4" hits="0"/>
+                        <line number="5" hits="0"/>
+                        <line number="6" hits="0"/>
+                        <line number="7" hits="1"/>
+                        <line number="8" hits="1"/>
+                        <line number="9" hits="1"/>
+                        <line number="10" hits="1"/>
+                    </lines>
+                </class>
+            </classes>
+        </package>
+    </packages>
+</coverage>"""  # noqa: E501
+
+
+@pytest.fixture(scope="session")
+def covmapy_env() -> dict[str, str]:
+    """Return the environment for covmapy subprocesses, checking once that the CLI is importable."""
+    if importlib.util.find_spec("covmapy.__main__") is None:
+        pytest.fail("covmapy.__main__ is not importable")
+
+    src_dir = Path(covmapy_package.__file__).parents[1]
+    python_path = os.pathsep.join(filter(None, [str(src_dir), os.environ.get("PYTHONPATH")]))
+    return {**os.environ, "PYTHONPATH": python_path}
+
+
+@pytest.fixture(scope="session")
+def run_covmapy(covmapy_env: dict[str, str]) -> CovmapyRunner:
+    """Return a helper that runs the covmapy CLI with the current interpreter."""
+
+    def run(*args: str) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(  # noqa: S603
+            [sys.executable, "-m", "covmapy", *args],
+            capture_output=True,
+            text=True,
+            check=False,
+            env=covmapy_env,
+        )
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def sample_coverage_xml(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Write the sample coverage report once and return its path."""
+    file_path = tmp_path_factory.mktemp("coverage") / "coverage.xml"
+    file_path.write_text(SAMPLE_COVERAGE_XML, encoding="utf-8")
+    return file_path
+
+
+@pytest.fixture(scope="session")
+def parsed_coverage(sample_coverage_xml: Path) -> HierarchicalCoverageReport:
+    """Parse the sample coverage report once so rendering tests can share the model."""
+    with sample_coverage_xml.open("rb") as source:
+        return XMLCoverageParser().parse_hierarchical_stream(source)
@@ -0,0 +1,49 @@
+"""Integration tests for the coverage plotter with its real dependencies."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from covmapy.core import PlotlyCoveragePlotter
+from covmapy.parser import XMLCoverageParser
+from covmapy.plotly_treemap import PlotlyTreemapLayout
+
+
+class TestCoreIntegration:
+    """Integration tests for PlotlyCoveragePlotter with a real parser and layout engine."""
+
+    @pytest.mark.slow
+    def test_integration_with_real_dependencies(self, tmp_path: Path) -> None:
+        """Test integration with real parser and layout engine."""
+        # Create real dependencies
+        parser = XMLCoverageParser()
+        layout_engine = PlotlyTreemapLayout()
+        plotter = PlotlyCoveragePlotter(parser, layout_engine)
+
+        # Create test XML
+        coverage_xml = """<?xml version="1.0" ?>
+<coverage version="7.3.2">
+    <packages>
+        <package name="src">
+            <classes>
+                <class filename="src/test.py" name="test.py">
+                    <lines>
+                        <line hits="1" number="1"/>
+                        <line hits="0" number="2"/>
+                    </lines>
+                </class>
+            </classes>
+        </package>
+    </packages>
+</coverage>"""
+
+        output_path = str(tmp_path / "output.html")
+
+        # Execute - should not raise
+        plotter.plot(coverage_xml, output_path)
+
+        # Verify file was created
+        assert Path(output_path).exists()
+        assert Path(output_path).stat().st_size > 0
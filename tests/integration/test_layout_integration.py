@@ -0,0 +1,40 @@
+"""Integration tests for rendering a parsed coverage report."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from covmapy.plotly_treemap import PlotlyTreemapLayout
+
+if TYPE_CHECKING:
+    from covmapy.models import HierarchicalCoverageReport
+
+
+class TestLayoutIntegration:
+    """Integration tests for the treemap layout fed by the XML parser."""
+
+    def test_figure_contains_parsed_files(self, parsed_coverage: HierarchicalCoverageReport) -> None:
+        """Test that every parsed file and directory appears in the treemap."""
+        figure = PlotlyTreemapLayout().generate_figure(parsed_coverage)
+
+        trace = figure.data[0]
+        assert trace.labels == ("covmapy", "cli.py", "core.py")
+        assert trace.values == (20, 10, 10)
+
+    @pytest.mark.parametrize(("width", "height"), [(800, 600), (1200, 800)])
+    def test_figure_dimensions(self, parsed_coverage: HierarchicalCoverageReport, width: int, height: int) -> None:
+        """Test that the requested size reaches the figure layout."""
+        figure = PlotlyTreemapLayout().generate_figure(parsed_coverage, width=width, height=height)
+
+        assert figure.layout.width == width
+        assert figure.layout.height == height
+
+    @pytest.mark.parametrize("colorscale", ["RdYlGn", "Viridis", "Spectral"])
+    def test_figure_colorscale(self, parsed_coverage: HierarchicalCoverageReport, colorscale: str) -> None:
+        """Test that each colorscale renders the same shared report."""
+        figure = PlotlyTreemapLayout(colorscale=colorscale).generate_figure(parsed_coverage)
+
+        assert figure.data[0].marker.colorscale
+        assert len(figure.data[0].ids) == len(figure.data[0].parents)
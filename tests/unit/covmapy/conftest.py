@@ -0,0 +1,18 @@
+"""Shared fixtures for covmapy unit tests."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture(scope="session")
+def bad_encoding_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Write a coverage file that is not valid UTF-8 once and return its path."""
+    file_path = tmp_path_factory.mktemp("encoding") / "bad_encoding.xml"
+    file_path.write_bytes(b"\xff\xfe Invalid UTF-8")
+    return file_path
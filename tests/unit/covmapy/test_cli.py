@@ -1,11 +1,18 @@
 """Unit tests for CLI module."""
 
+import os
+import re
+import subprocess
+import sys
+from dataclasses import FrozenInstanceError
 from pathlib import Path
+from typing import Callable
 from unittest.mock import Mock, patch
 
 import pytest
 from click.testing import CliRunner
 
+import covmapy as covmapy_package
 from covmapy.cli import (
     PlotOptions,
     _create_plotter,
@@ -13,6 +20,7 @@ from covmapy.cli import (
     covmapy,
     main,
 )
+from covmapy.constants import SupportedColorscales
 from covmapy.core import CoveragePlotter, PlotlyCoveragePlotter
 from covmapy.exceptions import UnsupportedFormatError
 from covmapy.models import OutputFormat
@@ -20,6 +28,23 @@ from covmapy.parser import XMLCoverageParser
 from covmapy.plotly_treemap import PlotlyTreemapLayout
 
 
+class TestLazyImports:
+    """Test that heavy dependencies are imported on demand."""
+
+    def test_cli_import_does_not_load_plotly(self) -> None:
+        """Test that importing the CLI defers loading plotly until a plot is created."""
+        src_dir = Path(covmapy_package.__file__).parents[1]
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, covmapy.cli; print('plotly' in sys.modules)"],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": str(src_dir)},
+        )
+
+        assert result.stdout.strip() == "False"
+
+
 class TestPlotOptions:
     """Test PlotOptions dataclass."""
 
@@ -49,6 +74,13 @@ class TestPlotOptions:
         assert options.colorscale == "Viridis"
         assert options.format == "html"
 
+    def test_options_are_immutable(self) -> None:
+        """Test that validated options cannot be changed afterwards."""
+        options = PlotOptions()
+
+        with pytest.raises(FrozenInstanceError):
+            options.width = 0  # type: ignore[misc]
+
     def test_validation_positive_width(self) -> None:
         """Test width validation."""
         with pytest.raises(ValueError, match="width must be positive"):
@@ -71,12 +103,11 @@ class TestPlotOptions:
     )
     def test_validation_invalid_format(self, invalid_format: str) -> None:
         """Test format validation with invalid formats."""
-        with pytest.raises(ValueError) as exc_info:
+        with pytest.raises(
+            ValueError, match=rf"Invalid format: {re.escape(invalid_format)}\..*Supported formats: 'html'"
+        ):
             PlotOptions(format=invalid_format)
 
-        assert f"Invalid format: {invalid_format}" in str(exc_info.value)
-        assert "Supported formats: 'html'" in str(exc_info.value)
-
     def test_validation_valid_format(self) -> None:
         """Test format validation with valid format."""
         # Should not raise
@@ -89,11 +120,9 @@ class TestPlotOptions:
     )
     def test_validation_invalid_colorscale(self, invalid_colorscale: str) -> None:
         """Test colorscale validation with invalid values."""
-        with pytest.raises(ValueError) as exc_info:
+        with pytest.raises(ValueError, match=rf"Invalid colorscale: {re.escape(invalid_colorscale)}"):
             PlotOptions(colorscale=invalid_colorscale)
 
-        assert f"Invalid colorscale: {invalid_colorscale}" in str(exc_info.value)
-
     @pytest.mark.parametrize(
         "valid_colorscale",
         ["RdYlGn", "Viridis", "Blues", "Reds", "YlOrRd", "YlGnBu", "RdBu", "Spectral"],
@@ -104,6 +133,11 @@ class TestPlotOptions:
         options = PlotOptions(colorscale=valid_colorscale)
         assert options.colorscale == valid_colorscale
 
+    def test_validation_sets_match_choices(self) -> None:
+        """Test that the validation sets agree with the advertised choices."""
+        assert frozenset(SupportedColorscales.SCALES) == SupportedColorscales.SCALE_SET
+        assert all(OutputFormat.is_supported(fmt) for fmt in OutputFormat.get_supported_formats())
+
 
 class TestCreatePlotter:
     """Test _create_plotter function."""
@@ -117,6 +151,14 @@ class TestCreatePlotter:
         assert isinstance(plotter.parser, XMLCoverageParser)
         assert isinstance(plotter.layout_engine, PlotlyTreemapLayout)
         assert plotter.layout_engine.colorscale == "Viridis"
+        assert plotter.embed_plotlyjs is False
+
+    def test_create_plotter_embed_plotlyjs(self) -> None:
+        """Test that the plotly.js embedding option reaches the plotter."""
+        plotter = _create_plotter(PlotOptions(embed_plotlyjs=True))
+
+        assert isinstance(plotter, PlotlyCoveragePlotter)
+        assert plotter.embed_plotlyjs is True
 
 
 class TestGenerateCoveragePlot:
@@ -138,12 +180,14 @@ class TestGenerateCoveragePlot:
         self,
         coverage_file: Path,
         mock_plotter: Mock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test _generate_coverage_plot with mock plotter."""
         options = PlotOptions(output="test.html", width=1024, height=768, format="html")
+        echoed: list[str] = []
+        monkeypatch.setattr("covmapy.cli.click.echo", echoed.append)
 
-        with patch("covmapy.cli.click.echo") as mock_echo:
-            _generate_coverage_plot(coverage_file, options, mock_plotter)
+        _generate_coverage_plot(coverage_file, options, mock_plotter)
 
         # Verify plotter was called
         mock_plotter.plot_from_file.assert_called_once_with(
@@ -155,9 +199,10 @@ class TestGenerateCoveragePlot:
         )
 
         # Verify echo calls
-        assert mock_echo.call_count == 2
-        mock_echo.assert_any_call(f"Generating coverage visualization from {coverage_file}...")
-        mock_echo.assert_any_call("Coverage visualization saved to test.html")
+        assert echoed == [
+            f"Generating coverage visualization from {coverage_file}...",
+            "Coverage visualization saved to test.html",
+        ]
 
     def test_generate_coverage_plot_plotter_error(
         self,
@@ -172,49 +217,68 @@ class TestGenerateCoveragePlot:
             _generate_coverage_plot(coverage_file, options, mock_plotter)
 
 
-class TestCoveragePlotCommand:
-    """Test covmapy Click command."""
+PlotterFactory = Callable[[PlotOptions], CoveragePlotter]
 
-    @pytest.fixture
-    def runner(self) -> CliRunner:
-        """Create Click test runner."""
-        return CliRunner()
 
-    @pytest.fixture
-    def coverage_file(self, tmp_path: Path) -> Path:
-        """Create test coverage file."""
-        file_path = tmp_path / "coverage.xml"
-        file_path.write_text(
-            """<?xml version="1.0" ?>
+@pytest.fixture(scope="session")
+def plotter_cache() -> dict[tuple[str, bool], CoveragePlotter]:
+    """Create the cache of plotters shared by all tests, keyed by the options they depend on."""
+    return {}
+
+
+@pytest.fixture
+def get_plotter(plotter_cache: dict[tuple[str, bool], CoveragePlotter]) -> PlotterFactory:
+    """Return a helper that reuses one plotter per colorscale and embedding mode."""
+
+    def get(options: PlotOptions) -> CoveragePlotter:
+        key = (options.colorscale, options.embed_plotlyjs)
+        plotter = plotter_cache.get(key)
+        if plotter is None:
+            plotter = plotter_cache[key] = _create_plotter(options)
+        return plotter
+
+    return get
+
+
+@pytest.fixture(scope="module")
+def runner() -> CliRunner:
+    """Create Click test runner shared by the tests in this module."""
+    return CliRunner()
+
+
+@pytest.fixture(scope="module")
+def coverage_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create test coverage file once; tests only read it."""
+    file_path = tmp_path_factory.mktemp("cli_command") / "coverage.xml"
+    file_path.write_text(
+        """<?xml version="1.0" ?>
 <coverage version="7.3.2">
     <packages>
         <package name="src">
             <classes>
-                <class filename="src/test.py" name="test.py">
+                <class filename="src/main.py" name="main.py">
+                    <lines>
+                        <line hits="1" number="1"/>
+                        <line hits="1" number="2"/>
+                        <line hits="0" number="3"/>
+                    </lines>
+                </class>
+                <class filename="src/utils.py" name="utils.py">
                     <lines>
                         <line hits="1" number="1"/>
+                        <line hits="0" number="2"/>
                     </lines>
                 </class>
             </classes>
         </package>
     </packages>
 </coverage>"""
-        )
-        return file_path
-
-    def test_coverage_plot_success(self, runner: CliRunner, coverage_file: Path, tmp_path: Path) -> None:
-        """Test successful coverage plot generation."""
-        output_file = tmp_path / "output.html"
+    )
+    return file_path
 
-        result = runner.invoke(
-            covmapy,
-            [str(coverage_file), "--output", str(output_file)],
-        )
 
-        assert result.exit_code == 0
-        assert "Generating coverage visualization" in result.output
-        assert "Coverage visualization saved" in result.output
-        assert output_file.exists()
+class TestCoveragePlotCommand:
+    """Test covmapy Click command."""
 
     def test_coverage_plot_nonexistent_file(self, runner: CliRunner) -> None:
         """Test coverage plot with non-existent file."""
@@ -223,48 +287,13 @@ class TestCoveragePlotCommand:
         assert result.exit_code != 0
         # Click should handle the file not found error
 
-    def test_coverage_plot_custom_options(self, runner: CliRunner, coverage_file: Path, tmp_path: Path) -> None:
-        """Test coverage plot with custom options."""
-        output_file = tmp_path / "custom.html"
-
-        result = runner.invoke(
-            covmapy,
-            [
-                str(coverage_file),
-                "--output",
-                str(output_file),
-                "--width",
-                "1024",
-                "--height",
-                "768",
-                "--colorscale",
-                "Viridis",
-            ],
-        )
-
-        assert result.exit_code == 0
-        assert output_file.exists()
-
-    @pytest.mark.parametrize(
-        "width,height",
-        [
-            ("0", "800"),
-            ("-100", "800"),
-            ("1200", "0"),
-            ("1200", "-50"),
-        ],
-    )
-    def test_coverage_plot_invalid_dimensions(
-        self,
-        runner: CliRunner,
-        coverage_file: Path,
-        width: str,
-        height: str,
-    ) -> None:
-        """Test coverage plot with invalid dimensions."""
+    def test_coverage_plot_invalid_dimensions(self, runner: CliRunner, coverage_file: Path) -> None:
+        """Test that invalid dimensions are reported as a CLI error."""
+        # One invalid value is enough to check the error path through Click; every
+        # width/height case is covered by TestPlotOptions without invoking the CLI
         result = runner.invoke(
             covmapy,
-            [str(coverage_file), "--width", width, "--height", height],
+            [str(coverage_file), "--width", "0", "--height", "800"],
         )
 
         assert result.exit_code != 0
@@ -293,22 +322,27 @@ class TestCoveragePlotCommand:
     def test_coverage_plot_short_options(self, runner: CliRunner, coverage_file: Path, tmp_path: Path) -> None:
         """Test coverage plot with short option flags."""
         output_file = tmp_path / "short.html"
+        # Only option parsing is under test here, so skip rendering the treemap
+        mock_plotter = Mock(spec=CoveragePlotter)
 
-        result = runner.invoke(
-            covmapy,
-            [
-                str(coverage_file),
-                "-o",
-                str(output_file),
-                "-w",
-                "1200",
-                "-h",
-                "800",
-            ],
-        )
+        with patch("covmapy.cli._create_plotter", return_value=mock_plotter):
+            result = runner.invoke(
+                covmapy,
+                [
+                    str(coverage_file),
+                    "-o",
+                    str(output_file),
+                    "-w",
+                    "1200",
+                    "-h",
+                    "800",
+                ],
+            )
 
         assert result.exit_code == 0
-        assert output_file.exists()
+        mock_plotter.plot_from_file.assert_called_once_with(
+            coverage_file, str(output_file), width=1200, height=800, format_="html"
+        )
 
     def test_coverage_plot_help(self, runner: CliRunner) -> None:
         """Test coverage plot help output."""
@@ -321,17 +355,6 @@ class TestCoveragePlotCommand:
         assert "--height" in result.output
         assert "--colorscale" in result.output
 
-    def test_coverage_plot_valid_colorscales(self, runner: CliRunner, coverage_file: Path) -> None:
-        """Test that all valid colorscales work."""
-        valid_colorscales = ["RdYlGn", "Viridis", "Blues", "Reds", "YlOrRd", "YlGnBu", "RdBu", "Spectral"]
-
-        for colorscale in valid_colorscales:
-            result = runner.invoke(
-                covmapy,
-                [str(coverage_file), "--colorscale", colorscale],
-            )
-            assert result.exit_code == 0, f"Failed with colorscale: {colorscale}"
-
 
 class TestMainFunction:
     """Test main function."""
@@ -346,79 +369,31 @@ class TestMainFunction:
 class TestIntegration:
     """Integration tests for CLI module."""
 
-    def test_end_to_end_workflow(self, tmp_path: Path) -> None:
+    @pytest.mark.slow
+    def test_end_to_end_workflow(self, get_plotter: PlotterFactory, coverage_file: Path, tmp_path: Path) -> None:
         """Test complete end-to-end workflow."""
-        # Create coverage file
-        coverage_file = tmp_path / "coverage.xml"
-        coverage_file.write_text(
-            """<?xml version="1.0" ?>
-<coverage version="7.3.2">
-    <packages>
-        <package name="src">
-            <classes>
-                <class filename="src/main.py" name="main.py">
-                    <lines>
-                        <line hits="1" number="1"/>
-                        <line hits="1" number="2"/>
-                        <line hits="0" number="3"/>
-                    </lines>
-                </class>
-                <class filename="src/utils.py" name="utils.py">
-                    <lines>
-                        <line hits="1" number="1"/>
-                        <line hits="0" number="2"/>
-                    </lines>
-                </class>
-            </classes>
-        </package>
-    </packages>
-</coverage>"""
-        )
-
         output_file = tmp_path / "result.html"
         options = PlotOptions(output=str(output_file), width=1024, height=768, colorscale="Viridis")
 
-        # Create plotter dependencies
-        parser = XMLCoverageParser()
-        layout_engine = PlotlyTreemapLayout(colorscale=options.colorscale)
-        plotter = PlotlyCoveragePlotter(parser, layout_engine)
-
         # Run the workflow
-        _generate_coverage_plot(coverage_file, options, plotter)
+        _generate_coverage_plot(coverage_file, options, get_plotter(options))
 
         # Verify results
         assert output_file.exists()
         assert output_file.stat().st_size > 0
 
-        # Verify content contains expected HTML structure
-        content = output_file.read_text(encoding="utf-8")
-        assert "<!DOCTYPE html>" in content or "<html>" in content
-        assert "plotly" in content.lower()
+        # Verify the document starts as HTML that loads Plotly; both markers sit in the
+        # page header, so the trace data after it never needs to be read or decoded
+        with output_file.open("rb") as html_file:
+            head = html_file.read(4096)
+        assert b"<!DOCTYPE html>" in head or b"<html>" in head
+        assert b"plotly" in head.lower()
 
-    def test_cli_command_integration(self, tmp_path: Path) -> None:
+    @pytest.mark.slow
+    def test_cli_command_integration(self, runner: CliRunner, coverage_file: Path, tmp_path: Path) -> None:
         """Test CLI command integration."""
-        # Create test file
-        coverage_file = tmp_path / "test.xml"
-        coverage_file.write_text(
-            """<?xml version="1.0" ?>
-<coverage>
-    <packages>
-        <package name="test">
-            <classes>
-                <class filename="test.py">
-                    <lines>
-                        <line hits="1" number="1"/>
-                    </lines>
-                </class>
-            </classes>
-        </package>
-    </packages>
-</coverage>"""
-        )
-
         output_file = tmp_path / "cli_test.html"
 
-        runner = CliRunner()
         result = runner.invoke(
             covmapy,
             [
@@ -437,3 +412,46 @@ class TestIntegration:
         assert result.exit_code == 0
         assert output_file.exists()
         assert "saved" in result.output
+
+    def test_generate_coverage_plot_success(
+        self, get_plotter: PlotterFactory, coverage_file: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test successful coverage plot generation without going through Click."""
+        output_file = tmp_path / "output.html"
+        options = PlotOptions(output=str(output_file))
+
+        _generate_coverage_plot(coverage_file, options, get_plotter(options))
+
+        captured = capsys.readouterr()
+        assert "Generating coverage visualization" in captured.out
+        assert "Coverage visualization saved" in captured.out
+        assert output_file.exists()
+
+    def test_generate_coverage_plot_custom_options(self, coverage_file: Path, tmp_path: Path) -> None:
+        """Test that custom options reach the plotter."""
+        output_file = tmp_path / "custom.html"
+        options = PlotOptions(output=str(output_file), width=1024, height=768, colorscale="Viridis")
+        # Rendering is covered by the other workflow tests; only the forwarding matters here
+        mock_plotter = Mock(spec=CoveragePlotter)
+
+        _generate_coverage_plot(coverage_file, options, mock_plotter)
+
+        mock_plotter.plot_from_file.assert_called_once_with(
+            coverage_file, str(output_file), width=1024, height=768, format_="html"
+        )
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize(
+        "colorscale", ["RdYlGn", "Viridis", "Blues", "Reds", "YlOrRd", "YlGnBu", "RdBu", "Spectral"]
+    )
+    def test_generate_coverage_plot_valid_colorscales(
+        self, get_plotter: PlotterFactory, coverage_file: Path, tmp_path: Path, colorscale: str
+    ) -> None:
+        """Test that all valid colorscales work."""
+        # Each case writes its own output so parametrized runs never share a file
+        output_file = tmp_path / "output.html"
+        options = PlotOptions(output=str(output_file), colorscale=colorscale)
+
+        _generate_coverage_plot(coverage_file, options, get_plotter(options))
+
+        assert output_file.exists()
@@ -4,14 +4,25 @@ from covmapy.color import GradientColorMapper, ThreeStageColorMapper
 from covmapy.constants import ColorValues
 
 
+@pytest.fixture(scope="module")
+def gradient_mapper() -> GradientColorMapper:
+    """Create the default gradient mapper shared by this module."""
+    return GradientColorMapper()
+
+
+@pytest.fixture(scope="module")
+def three_stage_mapper() -> ThreeStageColorMapper:
+    """Create the three-stage mapper shared by this module."""
+    return ThreeStageColorMapper()
+
+
 class TestGradientColorMapper:
     """Test GradientColorMapper class."""
 
-    def test_gradient_color_mapper_default_colors(self) -> None:
+    def test_gradient_color_mapper_default_colors(self, gradient_mapper: GradientColorMapper) -> None:
         """Test mapper with default red to green gradient."""
-        mapper = GradientColorMapper()
-        assert mapper.low_color == ColorValues.RED
-        assert mapper.high_color == ColorValues.GREEN
+        assert gradient_mapper.low_color == ColorValues.RED
+        assert gradient_mapper.high_color == ColorValues.GREEN
 
     def test_gradient_color_mapper_custom_colors(self) -> None:
         """Test mapper with custom colors."""
@@ -21,6 +32,16 @@ class TestGradientColorMapper:
         assert mapper.low_color == low_color
         assert mapper.high_color == high_color
 
+    def test_gradient_color_mapper_color_change_rebuilds_lookup(self) -> None:
+        """Test that changing the end colors after construction changes the mapped colors."""
+        mapper = GradientColorMapper()
+
+        mapper.low_color = (0, 0, 255)
+        mapper.high_color = (255, 255, 255)
+
+        assert mapper.get_color(0.0) == (0, 0, 255)
+        assert mapper.get_colors([0.5, 1.0]) == [(127, 127, 255), (255, 255, 255)]
+
     @pytest.mark.parametrize(
         "coverage_rate,expected_color",
         [
@@ -32,18 +53,18 @@ class TestGradientColorMapper:
         ],
     )
     def test_gradient_color_mapper_interpolation_default_gradient(
-        self, coverage_rate: float, expected_color: tuple[int, int, int]
+        self, gradient_mapper: GradientColorMapper, coverage_rate: float, expected_color: tuple[int, int, int]
     ) -> None:
         """Test color interpolation with default gradient."""
-        mapper = GradientColorMapper()
-        color = mapper.get_color(coverage_rate)
+        color = gradient_mapper.get_color(coverage_rate)
         assert color == expected_color
 
     @pytest.mark.parametrize("coverage_rate", [-0.5, -0.1, 1.1, 2.0])
-    def test_gradient_color_mapper_coverage_rate_clamping(self, coverage_rate: float) -> None:
+    def test_gradient_color_mapper_coverage_rate_clamping(
+        self, gradient_mapper: GradientColorMapper, coverage_rate: float
+    ) -> None:
         """Test that coverage rates are clamped to [0, 1]."""
-        mapper = GradientColorMapper()
-        color = mapper.get_color(coverage_rate)
+        color = gradient_mapper.get_color(coverage_rate)
 
         if coverage_rate < 0:
             assert color == ColorValues.RED
@@ -80,6 +101,22 @@ class TestGradientColorMapper:
         mid_b = int(low_color[2] + (high_color[2] - low_color[2]) * 0.5)
         assert mapper.get_color(0.5) == (mid_r, mid_g, mid_b)
 
+    def test_gradient_color_mapper_lookup_matches_interpolation(self) -> None:
+        """Test that table lookups agree with direct interpolation on table steps."""
+        mapper = GradientColorMapper(low_color=(10, 20, 30), high_color=(250, 5, 128))
+        steps = ColorValues.LUT_RESOLUTION
+
+        for i in range(steps + 1):
+            rate = i / steps
+            assert mapper.get_color(rate) == mapper._compute_color(rate)
+
+    def test_gradient_color_mapper_get_colors(self, gradient_mapper: GradientColorMapper) -> None:
+        """Test batch color mapping matches single lookups."""
+        rates = [-0.5, 0.0, 0.25, 0.5, 0.75, 1.0, 2.0]
+
+        assert gradient_mapper.get_colors(rates) == [gradient_mapper.get_color(rate) for rate in rates]
+        assert gradient_mapper.get_colors([]) == []
+
 
 class TestThreeStageColorMapper:
     """Test ThreeStageColorMapper class."""
@@ -102,82 +139,80 @@ class TestThreeStageColorMapper:
         ],
     )
     def test_three_stage_color_mapper_gradient(
-        self, coverage_rate: float, expected_color: tuple[int, int, int]
+        self, three_stage_mapper: ThreeStageColorMapper, coverage_rate: float, expected_color: tuple[int, int, int]
     ) -> None:
         """Test three-stage gradient color mapping."""
-        mapper = ThreeStageColorMapper()
-        color = mapper.get_color(coverage_rate)
+        color = three_stage_mapper.get_color(coverage_rate)
         assert color == expected_color
 
     @pytest.mark.parametrize("coverage_rate", [-0.5, -0.1, 1.1, 2.0])
-    def test_three_stage_color_mapper_coverage_rate_clamping(self, coverage_rate: float) -> None:
+    def test_three_stage_color_mapper_coverage_rate_clamping(
+        self, three_stage_mapper: ThreeStageColorMapper, coverage_rate: float
+    ) -> None:
         """Test that coverage rates are clamped to [0, 1]."""
-        mapper = ThreeStageColorMapper()
-        color = mapper.get_color(coverage_rate)
+        color = three_stage_mapper.get_color(coverage_rate)
 
         if coverage_rate < 0:
             assert color == ColorValues.RED
         else:
             assert color == ColorValues.GREEN
 
-    def test_three_stage_color_mapper_stage_boundaries(self) -> None:
+    def test_three_stage_color_mapper_stage_boundaries(self, three_stage_mapper: ThreeStageColorMapper) -> None:
         """Test color values at stage boundaries."""
-        mapper = ThreeStageColorMapper()
-
-        assert mapper.get_color(0.0) == ColorValues.RED
-        assert mapper.get_color(0.3) == (
+        assert three_stage_mapper.get_color(0.0) == ColorValues.RED
+        assert three_stage_mapper.get_color(0.3) == (
             ColorValues.RGB_MAX_VALUE,
             ColorValues.ORANGE_GREEN_BASE,
             ColorValues.BLUE_COMPONENT,
         )
-        assert mapper.get_color(0.7) == (
+        assert three_stage_mapper.get_color(0.7) == (
             ColorValues.RGB_MAX_VALUE,
             ColorValues.RGB_MAX_VALUE,
             ColorValues.BLUE_COMPONENT,
         )
-        assert mapper.get_color(1.0) == ColorValues.GREEN
+        assert three_stage_mapper.get_color(1.0) == ColorValues.GREEN
 
     @pytest.mark.parametrize(
-        "rate,stage",
+        "rates,stage",
         [
-            (0.1, "low"),
-            (0.2, "low"),
-            (0.29, "low"),
-            (0.31, "middle"),
-            (0.5, "middle"),
-            (0.69, "middle"),
-            (0.71, "high"),
-            (0.9, "high"),
-            (0.99, "high"),
+            ((0.1, 0.2, 0.29), "low"),
+            ((0.31, 0.5, 0.69), "middle"),
+            ((0.71, 0.9, 0.99), "high"),
         ],
     )
-    def test_three_stage_color_mapper_stage_detection(self, rate: float, stage: str) -> None:
+    def test_three_stage_color_mapper_stage_detection(
+        self, three_stage_mapper: ThreeStageColorMapper, rates: tuple[float, ...], stage: str
+    ) -> None:
         """Test that rates fall into correct stages."""
-        mapper = ThreeStageColorMapper()
-        color = mapper.get_color(rate)
-
-        if stage == "low":
-            assert color[0] == ColorValues.RGB_MAX_VALUE
-            assert ColorValues.BLUE_COMPONENT <= color[1] <= ColorValues.ORANGE_GREEN_BASE
-            assert color[2] == ColorValues.BLUE_COMPONENT
-        elif stage == "middle":
-            assert color[0] == ColorValues.RGB_MAX_VALUE
-            assert ColorValues.ORANGE_GREEN_BASE < color[1] < ColorValues.RGB_MAX_VALUE
-            assert color[2] == ColorValues.BLUE_COMPONENT
-        else:
-            assert ColorValues.BLUE_COMPONENT <= color[0] < ColorValues.RGB_MAX_VALUE
-            assert color[1] == ColorValues.RGB_MAX_VALUE
-            assert color[2] == ColorValues.BLUE_COMPONENT
 
-    def test_three_stage_color_mapper_smooth_transitions(self) -> None:
+        # One item per stage; every rate of the stage is checked in the same test
+        for rate, color in zip(rates, three_stage_mapper.get_colors(rates)):
+            if stage == "low":
+                assert color[0] == ColorValues.RGB_MAX_VALUE, rate
+                assert ColorValues.BLUE_COMPONENT <= color[1] <= ColorValues.ORANGE_GREEN_BASE, rate
+                assert color[2] == ColorValues.BLUE_COMPONENT, rate
+            elif stage == "middle":
+                assert color[0] == ColorValues.RGB_MAX_VALUE, rate
+                assert ColorValues.ORANGE_GREEN_BASE < color[1] < ColorValues.RGB_MAX_VALUE, rate
+                assert color[2] == ColorValues.BLUE_COMPONENT, rate
+            else:
+                assert ColorValues.BLUE_COMPONENT <= color[0] < ColorValues.RGB_MAX_VALUE, rate
+                assert color[1] == ColorValues.RGB_MAX_VALUE, rate
+                assert color[2] == ColorValues.BLUE_COMPONENT, rate
+
+    def test_three_stage_color_mapper_get_colors(self, three_stage_mapper: ThreeStageColorMapper) -> None:
+        """Test batch color mapping matches single lookups."""
+        rates = [i / 20 for i in range(-2, 23)]
+
+        assert three_stage_mapper.get_colors(iter(rates)) == [three_stage_mapper.get_color(rate) for rate in rates]
+
+    def test_three_stage_color_mapper_smooth_transitions(self, three_stage_mapper: ThreeStageColorMapper) -> None:
         """Test that color transitions are smooth between stages within each stage."""
-        mapper = ThreeStageColorMapper()
-
-        for i in range(100):
-            rate = i / 100.0
-            color = mapper.get_color(rate)
-            next_color = mapper.get_color(min(1.0, rate + 0.01))
+        rates = [i / 100.0 for i in range(101)]
+        # Map every rate in one batch and compare each color with the next one
+        colors = three_stage_mapper.get_colors(rates)
 
+        for rate, color, next_color in zip(rates, colors, colors[1:]):
             if 0.3 < rate < 0.7 or rate > 0.7:
                 assert abs(color[0] - next_color[0]) <= 10
 
@@ -1,8 +1,8 @@
 """Unit tests for coverage core module."""
 
-import contextlib
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from typing import Any, NamedTuple
+from unittest.mock import ANY, Mock
 
 import plotly.graph_objects as go  # type: ignore[import-untyped]
 import pytest
@@ -14,10 +14,39 @@ from covmapy.models import (
     FileCoverage,
     FileNode,
     HierarchicalCoverageReport,
+    OutputFormat,
 )
-from covmapy.parser import XMLCoverageParser
+from covmapy.parser import CoverageParseError, XMLCoverageParser
 from covmapy.plotly_treemap import PlotlyTreemapLayout
 
+_COVERAGE_XML = "<coverage>test</coverage>"
+_OUTPUT_HTML = "test_output.html"
+
+
+class WiredMocks(NamedTuple):
+    """Plotter collaborators wired to return the sample report and figure."""
+
+    parser: Mock
+    layout_engine: Mock
+    figure: Mock
+    report: HierarchicalCoverageReport
+
+
+@pytest.fixture(scope="module")
+def sample_hierarchical_report() -> HierarchicalCoverageReport:
+    """Create sample hierarchical coverage report.
+
+    Tests only hand the report to mocks as a return value, so one instance is shared.
+    """
+    root = DirectoryNode(name="src", path="src", children=[])
+    file_node = FileNode(
+        name="test.py",
+        path="src/test.py",
+        file_coverage=FileCoverage(filename="src/test.py", total_lines=10, covered_lines=8),
+    )
+    root.add_child(file_node)
+    return HierarchicalCoverageReport(root=root)
+
 
 class TestPlotlyCoveragePlotter:
     """Test PlotlyCoveragePlotter class."""
@@ -25,113 +54,102 @@ class TestPlotlyCoveragePlotter:
     @pytest.fixture
     def mock_parser(self) -> Mock:
         """Create mock XMLCoverageParser."""
-        return Mock(spec=XMLCoverageParser)
+        return Mock(spec_set=XMLCoverageParser)
 
     @pytest.fixture
     def mock_layout_engine(self) -> Mock:
         """Create mock PlotlyTreemapLayout."""
-        return Mock(spec=PlotlyTreemapLayout)
+        return Mock(spec_set=PlotlyTreemapLayout)
 
     @pytest.fixture
     def plotter(self, mock_parser: Mock, mock_layout_engine: Mock) -> PlotlyCoveragePlotter:
         """Create PlotlyCoveragePlotter instance with mocks."""
         return PlotlyCoveragePlotter(mock_parser, mock_layout_engine)
 
-    @pytest.fixture
-    def sample_hierarchical_report(self) -> HierarchicalCoverageReport:
-        """Create sample hierarchical coverage report."""
-        root = DirectoryNode(name="src", path="src", children=[])
-        file_node = FileNode(
-            name="test.py",
-            path="src/test.py",
-            file_coverage=FileCoverage(filename="src/test.py", total_lines=10, covered_lines=8),
-        )
-        root.add_child(file_node)
-        return HierarchicalCoverageReport(root=root)
-
     @pytest.fixture
     def mock_figure(self) -> Mock:
         """Create mock Plotly figure."""
-        figure = Mock(spec=go.Figure)
-        figure.write_html = Mock()
-        return figure
-
-    def test_init(self, mock_parser: Mock, mock_layout_engine: Mock) -> None:
-        """Test initialization with dependencies."""
-        plotter = PlotlyCoveragePlotter(mock_parser, mock_layout_engine)
-
-        assert plotter.parser is mock_parser
-        assert plotter.layout_engine is mock_layout_engine
+        return Mock(spec_set=go.Figure)
 
-    def test_plot_success(
+    @pytest.fixture
+    def wired(
         self,
-        plotter: PlotlyCoveragePlotter,
         mock_parser: Mock,
         mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
         mock_figure: Mock,
-    ) -> None:
-        """Test successful plot generation."""
-        coverage_xml = "<coverage>test</coverage>"
-        output_path = "test_output.html"
-
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.return_value = mock_figure
+        sample_hierarchical_report: HierarchicalCoverageReport,
+    ) -> WiredMocks:
+        """Wire the mocks so parsing returns the sample report and layout returns the mock figure."""
+        mock_parser.configure_mock(
+            **{
+                "parse_hierarchical.return_value": sample_hierarchical_report,
+                "parse_hierarchical_stream.return_value": sample_hierarchical_report,
+            }
+        )
+        mock_layout_engine.configure_mock(**{"generate_figure.return_value": mock_figure})
+        return WiredMocks(mock_parser, mock_layout_engine, mock_figure, sample_hierarchical_report)
 
-        # Execute
-        plotter.plot(coverage_xml, output_path)
+    def test_init(self, mock_parser: Mock, mock_layout_engine: Mock) -> None:
+        """Test initialization with dependencies."""
+        plotter = PlotlyCoveragePlotter(mock_parser, mock_layout_engine)
 
-        # Verify
-        mock_parser.parse_hierarchical.assert_called_once_with(coverage_xml)
-        mock_layout_engine.generate_figure.assert_called_once_with(sample_hierarchical_report, 1200, 800)
-        mock_figure.write_html.assert_called_once_with(output_path)
+        assert plotter.parser is mock_parser
+        assert plotter.layout_engine is mock_layout_engine
 
-    def test_plot_with_custom_dimensions(
+    @pytest.mark.parametrize(
+        ("from_file", "kwargs", "expected_size"),
+        [
+            (False, {}, (1200, 800)),
+            (False, {"width": 1024, "height": 768}, (1024, 768)),
+            (False, {"format_": "html"}, (1200, 800)),
+            (True, {}, (1200, 800)),
+            (True, {"width": 1024, "height": 768, "format_": "html"}, (1024, 768)),
+        ],
+        ids=["defaults", "custom-dimensions", "html-format", "file-defaults", "file-custom-params"],
+    )
+    def test_plot_variants(
         self,
         plotter: PlotlyCoveragePlotter,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
-        mock_figure: Mock,
+        tmp_path: Path,
+        wired: WiredMocks,
+        from_file: bool,
+        kwargs: dict[str, Any],
+        expected_size: tuple[int, int],
     ) -> None:
-        """Test plot generation with custom dimensions."""
-        coverage_xml = "<coverage>test</coverage>"
-        output_path = "test_output.html"
-        width = 1200
-        height = 800
-
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.return_value = mock_figure
+        """Test that plot and plot_from_file parse, lay out and write the report."""
+        output_path = str(tmp_path / _OUTPUT_HTML)
 
         # Execute
-        plotter.plot(coverage_xml, output_path, width=width, height=height)
+        if from_file:
+            coverage_file = tmp_path / "coverage.xml"
+            coverage_file.write_text(_COVERAGE_XML, encoding="utf-8")
+            plotter.plot_from_file(coverage_file, output_path, **kwargs)
+            wired.parser.parse_hierarchical_stream.assert_called_once()
+            wired.parser.parse_hierarchical.assert_not_called()
+        else:
+            plotter.plot(_COVERAGE_XML, output_path, **kwargs)
+            wired.parser.parse_hierarchical.assert_called_once_with(_COVERAGE_XML)
 
         # Verify
-        mock_layout_engine.generate_figure.assert_called_once_with(sample_hierarchical_report, width, height)
+        wired.layout_engine.generate_figure.assert_called_once_with(wired.report, *expected_size)
+        wired.figure.write_html.assert_called_once_with(ANY, include_plotlyjs="cdn")
+        assert wired.figure.write_html.call_args.args[0].name == output_path
 
-    def test_plot_html_format(
+    def test_plot_embed_plotlyjs(
         self,
         plotter: PlotlyCoveragePlotter,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
-        mock_figure: Mock,
+        tmp_path: Path,
+        wired: WiredMocks,
     ) -> None:
-        """Test plot generation with explicit HTML format."""
-        coverage_xml = "<coverage>test</coverage>"
-        output_path = "test_output.html"
-
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.return_value = mock_figure
+        """Test that plotly.js can be embedded instead of loaded from the CDN."""
+        output_path = str(tmp_path / _OUTPUT_HTML)
 
         # Execute
-        plotter.plot(coverage_xml, output_path, format_="html")
+        plotter.embed_plotlyjs = True
+        plotter.plot(_COVERAGE_XML, output_path)
 
         # Verify
-        mock_figure.write_html.assert_called_once_with(output_path)
+        wired.figure.write_html.assert_called_once_with(ANY, include_plotlyjs=True)
 
     @pytest.mark.parametrize(
         "format_",
@@ -140,23 +158,15 @@ class TestPlotlyCoveragePlotter:
     def test_plot_unsupported_format(
         self,
         plotter: PlotlyCoveragePlotter,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
-        mock_figure: Mock,
+        wired: WiredMocks,
         format_: str,
     ) -> None:
         """Test plot generation with unsupported formats."""
-        coverage_xml = "<coverage>test</coverage>"
         output_path = f"test_output.{format_}"
 
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.return_value = mock_figure
-
         # Execute and verify
         with pytest.raises(UnsupportedFormatError) as exc_info:
-            plotter.plot(coverage_xml, output_path, format_=format_)
+            plotter.plot(_COVERAGE_XML, output_path, format_=format_)
 
         assert format_ in str(exc_info.value)
         assert "html" in str(exc_info.value)
@@ -164,136 +174,47 @@ class TestPlotlyCoveragePlotter:
     def test_plot_invalid_format_enum(
         self,
         plotter: PlotlyCoveragePlotter,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
-        mock_figure: Mock,
+        wired: WiredMocks,
     ) -> None:
         """Test plot generation with invalid format that raises ValueError."""
-        coverage_xml = "<coverage>test</coverage>"
         output_path = "test_output.xyz"
 
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.return_value = mock_figure
-
         # Execute and verify
         with pytest.raises(UnsupportedFormatError) as exc_info:
-            plotter.plot(coverage_xml, output_path, format_="xyz")
+            plotter.plot(_COVERAGE_XML, output_path, format_="xyz")
 
         assert "xyz" in str(exc_info.value)
 
-    def test_plot_parser_error(
-        self,
-        plotter: PlotlyCoveragePlotter,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-    ) -> None:
-        """Test plot generation when parser raises error."""
-        coverage_xml = "<invalid>"
-        output_path = "test_output.html"
-
-        # Setup mocks
-        mock_parser.parse_hierarchical.side_effect = Exception("Parse error")
-
-        # Execute and verify
-        with pytest.raises(Exception, match="Parse error"):
-            plotter.plot(coverage_xml, output_path)
-
-        mock_layout_engine.generate_figure.assert_not_called()
-
-    def test_plot_layout_engine_error(
-        self,
-        plotter: PlotlyCoveragePlotter,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
-    ) -> None:
-        """Test plot generation when layout engine raises error."""
-        coverage_xml = "<coverage>test</coverage>"
-        output_path = "test_output.html"
-
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.side_effect = Exception("Layout error")
-
-        # Execute and verify
-        with pytest.raises(Exception, match="Layout error"):
-            plotter.plot(coverage_xml, output_path)
-
-    def test_plot_write_error(
-        self,
-        plotter: PlotlyCoveragePlotter,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
-        mock_figure: Mock,
-    ) -> None:
-        """Test plot generation when writing file raises error."""
-        coverage_xml = "<coverage>test</coverage>"
-        output_path = "test_output.html"
-
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.return_value = mock_figure
-        mock_figure.write_html.side_effect = OSError("Write error")
-
-        # Execute and verify
-        with pytest.raises(IOError, match="Write error"):
-            plotter.plot(coverage_xml, output_path)
-
-    def test_plot_from_file(
-        self,
-        plotter: PlotlyCoveragePlotter,
-        tmp_path: Path,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
-        mock_figure: Mock,
-    ) -> None:
-        """Test plot generation from file."""
-        # Create test file
-        coverage_file = tmp_path / "coverage.xml"
-        coverage_content = "<coverage>test content</coverage>"
-        coverage_file.write_text(coverage_content, encoding="utf-8")
-        output_path = str(tmp_path / "output.html")
-
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.return_value = mock_figure
-
-        # Execute
-        plotter.plot_from_file(coverage_file, output_path)
-
-        # Verify
-        mock_parser.parse_hierarchical.assert_called_once_with(coverage_content)
-        mock_layout_engine.generate_figure.assert_called_once_with(sample_hierarchical_report, 1200, 800)
-        mock_figure.write_html.assert_called_once_with(output_path)
-
-    def test_plot_from_file_with_custom_params(
+    @pytest.mark.parametrize(
+        ("failing_mock", "method", "error"),
+        [
+            ("parser", "parse_hierarchical", Exception("Parse error")),
+            ("layout_engine", "generate_figure", Exception("Layout error")),
+            ("figure", "write_html", OSError("Write error")),
+        ],
+        ids=["parser", "layout-engine", "write"],
+    )
+    def test_plot_propagates_errors(
         self,
         plotter: PlotlyCoveragePlotter,
         tmp_path: Path,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
-        mock_figure: Mock,
+        wired: WiredMocks,
+        failing_mock: str,
+        method: str,
+        error: Exception,
     ) -> None:
-        """Test plot generation from file with custom parameters."""
-        # Create test file
-        coverage_file = tmp_path / "coverage.xml"
-        coverage_file.write_text("<coverage>test</coverage>", encoding="utf-8")
-        output_path = str(tmp_path / "output.html")
+        """Test that errors from the parser, layout engine and figure writer propagate."""
+        output_path = str(tmp_path / _OUTPUT_HTML)
 
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.return_value = mock_figure
+        # Make one collaborator fail
+        getattr(getattr(wired, failing_mock), method).side_effect = error
 
-        # Execute
-        plotter.plot_from_file(coverage_file, output_path, width=1024, height=768, format_="html")
+        # Execute and verify
+        with pytest.raises(type(error), match=str(error)):
+            plotter.plot(_COVERAGE_XML, output_path)
 
-        # Verify
-        mock_layout_engine.generate_figure.assert_called_once_with(sample_hierarchical_report, 1024, 768)
+        # A parse failure stops before the layout engine is reached
+        assert wired.layout_engine.generate_figure.called is (failing_mock != "parser")
 
     def test_plot_from_nonexistent_file(
         self,
@@ -310,77 +231,45 @@ class TestPlotlyCoveragePlotter:
 
     def test_plot_from_file_encoding_error(
         self,
-        plotter: PlotlyCoveragePlotter,
         tmp_path: Path,
+        bad_encoding_file: Path,
+        mock_layout_engine: Mock,
     ) -> None:
         """Test plot generation from file with encoding error."""
-        # Create file with invalid encoding
-        coverage_file = tmp_path / "bad_encoding.xml"
-        coverage_file.write_bytes(b"\xff\xfe Invalid UTF-8")
         output_path = str(tmp_path / "output.html")
+        plotter = PlotlyCoveragePlotter(XMLCoverageParser(), mock_layout_engine)
 
         # Execute and verify
-        with pytest.raises(UnicodeDecodeError):
-            plotter.plot_from_file(coverage_file, output_path)
+        with pytest.raises(CoverageParseError) as exc_info:
+            plotter.plot_from_file(bad_encoding_file, output_path)
+        mock_layout_engine.generate_figure.assert_not_called()
+
+        # The message names the file and keeps the XML parser's explanation
+        assert exc_info.value.file_path == str(bad_encoding_file)
+        assert exc_info.value.reason.startswith("Invalid XML format: ")
+        assert "line 1" in exc_info.value.reason
 
-    @patch("covmapy.core.OutputFormat")
     def test_plot_output_format_get_supported_formats(
         self,
-        mock_output_format_class: MagicMock,
         plotter: PlotlyCoveragePlotter,
-        mock_parser: Mock,
-        mock_layout_engine: Mock,
-        sample_hierarchical_report: HierarchicalCoverageReport,
-        mock_figure: Mock,
+        wired: WiredMocks,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test that get_supported_formats is called when handling unsupported format."""
-        coverage_xml = "<coverage>test</coverage>"
         output_path = "test_output.pdf"
 
-        # Setup mocks
-        mock_parser.parse_hierarchical.return_value = sample_hierarchical_report
-        mock_layout_engine.generate_figure.return_value = mock_figure
+        # Record lookups of the supported formats; "pdf" is rejected by the real enum
+        lookups: list[str] = []
 
-        # Make OutputFormat constructor raise ValueError
-        mock_output_format_class.side_effect = ValueError("Invalid format")
-        mock_output_format_class.get_supported_formats.return_value = ["html"]
+        def get_supported_formats() -> list[str]:
+            lookups.append("get_supported_formats")
+            return ["html"]
+
+        monkeypatch.setattr(OutputFormat, "get_supported_formats", get_supported_formats)
 
         # Execute
-        with contextlib.suppress(UnsupportedFormatError):
-            plotter.plot(coverage_xml, output_path, format_="pdf")
+        with pytest.raises(UnsupportedFormatError, match="html"):
+            plotter.plot(_COVERAGE_XML, output_path, format_="pdf")
 
         # Verify get_supported_formats was called
-        mock_output_format_class.get_supported_formats.assert_called()
-
-    def test_integration_with_real_dependencies(self, tmp_path: Path) -> None:
-        """Test integration with real parser and layout engine."""
-        # Create real dependencies
-        parser = XMLCoverageParser()
-        layout_engine = PlotlyTreemapLayout()
-        plotter = PlotlyCoveragePlotter(parser, layout_engine)
-
-        # Create test XML
-        coverage_xml = """<?xml version="1.0" ?>
-<coverage version="7.3.2">
-    <packages>
-        <package name="src">
-            <classes>
-                <class filename="src/test.py" name="test.py">
-                    <lines>
-                        <line hits="1" number="1"/>
-                        <line hits="0" number="2"/>
-                    </lines>
-                </class>
-            </classes>
-        </package>
-    </packages>
-</coverage>"""
-
-        output_path = str(tmp_path / "output.html")
-
-        # Execute - should not raise
-        plotter.plot(coverage_xml, output_path)
-
-        # Verify file was created
-        assert Path(output_path).exists()
-        assert Path(output_path).stat().st_size > 0
+        assert lookups
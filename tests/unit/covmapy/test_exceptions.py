@@ -8,25 +8,24 @@ from covmapy.exceptions import UnsupportedFormatError
 class TestUnsupportedFormatError:
     """Test UnsupportedFormatError exception."""
 
-    def test_initialization_and_message(self) -> None:
+    @pytest.mark.parametrize(
+        ("format_", "supported_formats", "expected_message"),
+        [
+            ("pdf", ["html", "json"], "Unsupported output format: 'pdf'. Supported formats: 'html', 'json'"),
+            ("pdf", [], "Unsupported output format: 'pdf'. Supported formats: "),
+        ],
+        ids=["several-formats", "no-formats"],
+    )
+    def test_initialization_and_message(
+        self, format_: str, supported_formats: list[str], expected_message: str
+    ) -> None:
         """Test initialization and message formatting."""
-        format_ = "pdf"
-        supported_formats = ["html", "json"]
-
         error = UnsupportedFormatError(format_, supported_formats)
 
-        expected_message = "Unsupported output format: 'pdf'. Supported formats: 'html', 'json'"
         assert str(error) == expected_message
         assert error.format == format_
         assert error.supported_formats == supported_formats
 
-    def test_empty_supported_formats(self) -> None:
-        """Test with empty supported formats list."""
-        error = UnsupportedFormatError("pdf", [])
-
-        expected_message = "Unsupported output format: 'pdf'. Supported formats: "
-        assert str(error) == expected_message
-
     def test_inheritance(self) -> None:
         """Test that UnsupportedFormatError inherits from ValueError."""
         error = UnsupportedFormatError("pdf", ["html"])
@@ -1,3 +1,4 @@
+import sys
 from typing import Union, cast
 
 import pytest
@@ -8,9 +9,47 @@ from covmapy.models import (
     FileCoverage,
     FileNode,
     HierarchicalCoverageReport,
+    OutputFormat,
 )
 
 
+# FileCoverage is never mutated by the models, so tests share these instances
+@pytest.fixture(scope="module")
+def file1_coverage() -> FileCoverage:
+    """Create coverage for file1.py with 80 of 100 lines covered."""
+    return FileCoverage("file1.py", 100, 80)
+
+
+@pytest.fixture(scope="module")
+def file2_coverage() -> FileCoverage:
+    """Create coverage for file2.py with 25 of 50 lines covered."""
+    return FileCoverage("file2.py", 50, 25)
+
+
+@pytest.fixture(scope="module")
+def sample_py_coverage() -> FileCoverage:
+    """Create coverage for test.py with 75 of 100 lines covered."""
+    return FileCoverage("test.py", 100, 75)
+
+
+class TestOutputFormat:
+    """Test OutputFormat enum."""
+
+    def test_get_supported_formats(self) -> None:
+        """Test that supported formats list every enum value."""
+        assert OutputFormat.get_supported_formats() == [fmt.value for fmt in OutputFormat]
+
+    def test_get_supported_formats_returns_copy(self) -> None:
+        """Test that callers cannot mutate the cached format list."""
+        OutputFormat.get_supported_formats().append("pdf")
+        assert "pdf" not in OutputFormat.get_supported_formats()
+
+    @pytest.mark.parametrize("format_,expected", [("html", True), ("pdf", False), ("HTML", False)])
+    def test_is_supported(self, format_: str, expected: bool) -> None:
+        """Test supported format membership check."""
+        assert OutputFormat.is_supported(format_) is expected
+
+
 class TestFileCoverage:
     """Test FileCoverage model."""
 
@@ -100,32 +139,30 @@ class TestDirectoryNode:
         assert directory.covered_lines == 0
         assert directory.coverage_rate == 0.0
 
-    def test_directory_node_single_file_aggregation(self) -> None:
+    def test_directory_node_single_file_aggregation(self, file1_coverage: FileCoverage) -> None:
         """Test directory aggregation with single file."""
-        file_coverage = FileCoverage("file1.py", 100, 80)
-        file_node = FileNode("file1.py", "dir/file1.py", file_coverage)
+        file_node = FileNode("file1.py", "dir/file1.py", file1_coverage)
         directory = DirectoryNode(name="dir", path="dir", children=[file_node])
 
         assert directory.total_lines == 100
         assert directory.covered_lines == 80
         assert directory.coverage_rate == 0.8
 
-    def test_directory_node_multiple_files_aggregation(self) -> None:
+    def test_directory_node_multiple_files_aggregation(
+        self, file1_coverage: FileCoverage, file2_coverage: FileCoverage
+    ) -> None:
         """Test directory aggregation with multiple files."""
-        file1_coverage = FileCoverage("file1.py", 100, 80)
-        file2_coverage = FileCoverage("file2.py", 50, 25)
         file1 = FileNode("file1.py", "dir/file1.py", file1_coverage)
         file2 = FileNode("file2.py", "dir/file2.py", file2_coverage)
         directory = DirectoryNode(name="dir", path="dir", children=[file1, file2])
 
-        assert directory.total_lines == 150  # 100 + 50
-        assert directory.covered_lines == 105  # 80 + 25
-        assert directory.coverage_rate == 0.7  # 105/150
+        # (100 + 50, 80 + 25, 105/150)
+        assert (directory.total_lines, directory.covered_lines, directory.coverage_rate) == (150, 105, 0.7)
 
-    def test_directory_node_nested_aggregation(self) -> None:
+    def test_directory_node_nested_aggregation(
+        self, file1_coverage: FileCoverage, file2_coverage: FileCoverage
+    ) -> None:
         """Test nested directory aggregation."""
-        file1_coverage = FileCoverage("file1.py", 100, 80)
-        file2_coverage = FileCoverage("file2.py", 50, 25)
         file3_coverage = FileCoverage("file3.py", 200, 150)
 
         # Create nested structure: root -> subdir -> files
@@ -136,20 +173,14 @@ class TestDirectoryNode:
         subdir = DirectoryNode(name="subdir", path="root/subdir", children=[file2, file3])
         root = DirectoryNode(name="root", path="root", children=[file1, subdir])
 
-        # Test subdir aggregation
-        assert subdir.total_lines == 250  # 50 + 200
-        assert subdir.covered_lines == 175  # 25 + 150
-        assert subdir.coverage_rate == 0.7  # 175/250
+        # Test subdir aggregation: (50 + 200, 25 + 150, 175/250)
+        assert (subdir.total_lines, subdir.covered_lines, subdir.coverage_rate) == (250, 175, 0.7)
 
-        # Test root aggregation (includes all children)
-        assert root.total_lines == 350  # 100 + 250
-        assert root.covered_lines == 255  # 80 + 175
-        assert root.coverage_rate == 255 / 350  # approximately 0.729
+        # Test root aggregation (includes all children): (100 + 250, 80 + 175, ~0.729)
+        assert (root.total_lines, root.covered_lines, root.coverage_rate) == (350, 255, 255 / 350)
 
-    def test_directory_node_mixed_children(self) -> None:
+    def test_directory_node_mixed_children(self, file1_coverage: FileCoverage, file2_coverage: FileCoverage) -> None:
         """Test directory with mix of file and directory children."""
-        file1_coverage = FileCoverage("file1.py", 100, 80)
-        file2_coverage = FileCoverage("file2.py", 50, 25)
         file1 = FileNode("file1.py", "root/file1.py", file1_coverage)
 
         # Create subdirectory with its own file
@@ -176,6 +207,80 @@ class TestDirectoryNode:
         assert len(parent.children) == 1
         assert parent.children[0] is child
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots require Python 3.10+")
+    def test_directory_node_uses_slots(self) -> None:
+        """Test that tree nodes carry no per-instance __dict__."""
+        directory = DirectoryNode(name="dir", path="dir", children=[])
+        directory.add_child(FileNode("a.py", "dir/a.py", FileCoverage("a.py", 1, 1)))
+
+        assert not hasattr(directory, "__dict__")
+        assert not hasattr(directory.children[0], "__dict__")
+
+    def test_directory_node_add_child_invalidates_cached_totals(self) -> None:
+        """Test that adding a descendant refreshes cached totals up the tree."""
+        root = DirectoryNode(name="root", path="root", children=[])
+        subdir = DirectoryNode(name="sub", path="root/sub", children=[])
+        root.add_child(subdir)
+        subdir.add_child(FileNode("a.py", "root/sub/a.py", FileCoverage("a.py", 10, 5)))
+
+        assert root.total_lines == 10
+        assert root.coverage_rate == 0.5
+
+        subdir.add_child(FileNode("b.py", "root/sub/b.py", FileCoverage("b.py", 30, 30)))
+
+        assert subdir.total_lines == 40
+        assert root.total_lines == 40
+        assert root.covered_lines == 35
+
+    def test_directory_node_constructor_children_invalidate_cached_totals(self) -> None:
+        """Test that children passed to the constructor get a parent and refresh ancestor totals."""
+        subdir = DirectoryNode(name="sub", path="root/sub", children=[])
+        root = DirectoryNode(name="root", path="root", children=[subdir])
+
+        assert subdir.parent is root
+        assert root.total_lines == 0
+
+        subdir.add_child(FileNode("a.py", "root/sub/a.py", FileCoverage("a.py", 10, 5)))
+
+        assert (root.total_lines, root.covered_lines) == (10, 5)
+
+    def test_directory_node_equality_ignores_parent(self) -> None:
+        """Test that trees built through the constructor compare equal without recursing through parents."""
+
+        def build() -> HierarchicalCoverageReport:
+            file_node = FileNode("a.py", "d/a.py", FileCoverage("a.py", 10, 5))
+            return HierarchicalCoverageReport(root=DirectoryNode("d", "d", [file_node]))
+
+        first, second = build(), build()
+
+        assert first.root.children[0].parent is first.root
+        assert first == second
+        assert first.root.children[0] == second.root.children[0]
+        assert "parent" not in repr(first.root)
+
+    def test_directory_node_direct_append_refreshes_own_totals(self) -> None:
+        """Test that appending to children directly is picked up by that directory's totals."""
+        directory = DirectoryNode(name="dir", path="dir", children=[])
+        assert directory.total_lines == 0
+
+        directory.children.append(FileNode("a.py", "dir/a.py", FileCoverage("a.py", 4, 1)))
+
+        assert (directory.total_lines, directory.covered_lines) == (4, 1)
+
+    def test_directory_node_deep_tree_totals(self) -> None:
+        """Test that aggregating a very deep tree does not recurse per level."""
+        root = DirectoryNode(name="d0", path="d0", children=[])
+        current = root
+        for depth in range(1, sys.getrecursionlimit() * 2):
+            child = DirectoryNode(name=f"d{depth}", path=f"d{depth}", children=[])
+            current.add_child(child)
+            current = child
+        current.add_child(FileNode("leaf.py", "leaf.py", FileCoverage("leaf.py", 4, 3)))
+
+        assert root.total_lines == 4
+        assert root.covered_lines == 3
+        assert current.coverage_rate == 0.75
+
     def test_directory_node_add_child_directory(self) -> None:
         """Test that add_child works for directory children."""
         parent = DirectoryNode(name="parent", path="parent", children=[])
@@ -225,24 +330,6 @@ class TestDirectoryNode:
 class TestFileNode:
     """Test FileNode model."""
 
-    def test_file_node_property_delegation(self) -> None:
-        """Test that FileNode correctly delegates properties to FileCoverage."""
-        file_coverage = FileCoverage("test.py", 100, 75)
-        file_node = FileNode("test.py", "path/test.py", file_coverage)
-
-        assert file_node.total_lines == file_coverage.total_lines
-        assert file_node.covered_lines == file_coverage.covered_lines
-        assert file_node.coverage_rate == file_coverage.coverage_rate
-
-    def test_file_node_delegation_with_zero_lines(self) -> None:
-        """Test property delegation with zero lines edge case."""
-        file_coverage = FileCoverage("empty.py", 0, 0)
-        file_node = FileNode("empty.py", "path/empty.py", file_coverage)
-
-        assert file_node.total_lines == 0
-        assert file_node.covered_lines == 0
-        assert file_node.coverage_rate == 0.0
-
     @pytest.mark.parametrize(
         "total_lines,covered_lines,expected_rate",
         [
@@ -251,6 +338,7 @@ class TestFileNode:
             (200, 0, 0.0),
             (1, 1, 1.0),
             (10, 5, 0.5),
+            (0, 0, 0.0),  # Zero lines edge case
         ],
     )
     def test_file_node_delegation_parametrized(
@@ -267,16 +355,15 @@ class TestFileNode:
         assert file_node.covered_lines == covered_lines
         assert file_node.coverage_rate == expected_rate
 
-    def test_file_node_parent_initialization(self) -> None:
+    def test_file_node_parent_initialization(self, sample_py_coverage: FileCoverage) -> None:
         """Test FileNode parent relationship initialization."""
-        file_coverage = FileCoverage("test.py", 100, 75)
-        file_node = FileNode("test.py", "path/test.py", file_coverage)
+        file_node = FileNode("test.py", "path/test.py", sample_py_coverage)
 
         assert file_node.parent is None
 
         # Test with parent
         parent = DirectoryNode("dir", "path", [])
-        file_node_with_parent = FileNode("test.py", "path/test.py", file_coverage, parent)
+        file_node_with_parent = FileNode("test.py", "path/test.py", sample_py_coverage, parent)
 
         assert file_node_with_parent.parent is parent
 
@@ -314,10 +401,8 @@ class TestHierarchicalCoverageReport:
         assert report.root.name == "src"
         assert len(report.root.children) == 2
 
-        # Check aggregated values at root level
-        assert report.root.total_lines == 350  # 100 + 50 + 200
-        assert report.root.covered_lines == 280  # 80 + 40 + 160
-        assert report.root.coverage_rate == 0.8  # 280/350
+        # Check aggregated values at root level: (100 + 50 + 200, 80 + 40 + 160, 280/350)
+        assert (report.root.total_lines, report.root.covered_lines, report.root.coverage_rate) == (350, 280, 0.8)
 
     def test_hierarchical_coverage_report_empty_structure(self) -> None:
         """Test hierarchical report with empty root directory."""
@@ -341,25 +426,8 @@ class TestHierarchicalCoverageReport:
         root = DirectoryNode("root", "root", [a_dir])
 
         # Each level should aggregate correctly
-        assert d_dir.total_lines == 100
-        assert d_dir.covered_lines == 60
-        assert d_dir.coverage_rate == 0.6
-
-        assert c_dir.total_lines == 100
-        assert c_dir.covered_lines == 60
-        assert c_dir.coverage_rate == 0.6
-
-        assert b_dir.total_lines == 100
-        assert b_dir.covered_lines == 60
-        assert b_dir.coverage_rate == 0.6
-
-        assert a_dir.total_lines == 100
-        assert a_dir.covered_lines == 60
-        assert a_dir.coverage_rate == 0.6
-
-        assert root.total_lines == 100
-        assert root.covered_lines == 60
-        assert root.coverage_rate == 0.6
+        for directory in (d_dir, c_dir, b_dir, a_dir, root):
+            assert (directory.total_lines, directory.covered_lines, directory.coverage_rate) == (100, 60, 0.6)
 
     def test_parent_child_relationship_consistency(self) -> None:
         """Test that parent-child relationships are maintained correctly."""
@@ -1,9 +1,12 @@
 """Unit tests for coverage parser module."""
 
+import io
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from covmapy.constants import ParserConfig
 from covmapy.models import CoverageReport, DirectoryNode, FileCoverage, FileNode, HierarchicalCoverageReport
 from covmapy.parser import (
     CoverageParseError,
@@ -80,6 +83,41 @@ class TestXMLCoverageParser:
         assert file2.covered_lines == 1
         assert file2.coverage_rate == 0.5
 
+    def test_parse_across_feed_chunks(
+        self, parser: XMLCoverageParser, valid_xml: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that elements split across parser feed chunks are parsed correctly."""
+        monkeypatch.setattr(ParserConfig, "FEED_CHUNK_SIZE", 7)
+
+        report = parser.parse(valid_xml)
+
+        assert [(f.filename, f.total_lines, f.covered_lines) for f in report.files] == [
+            ("src/module1.py", 4, 3),
+            ("src/module2.py", 2, 1),
+        ]
+
+    def test_parse_stream(self, parser: XMLCoverageParser, valid_xml: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test parsing XML from a binary stream."""
+        monkeypatch.setattr(ParserConfig, "FEED_CHUNK_SIZE", 7)
+
+        report = parser.parse_stream(io.BytesIO(valid_xml.encode("utf-8")))
+
+        assert report == parser.parse(valid_xml)
+
+    def test_parse_stream_invalid_xml(self, parser: XMLCoverageParser) -> None:
+        """Test parsing invalid XML from a binary stream."""
+        with pytest.raises(InvalidXMLError):
+            parser.parse_stream(io.BytesIO(b"<coverage><unclosed>"))
+
+    def test_parse_hierarchical_stream(self, parser: XMLCoverageParser, valid_xml: str) -> None:
+        """Test hierarchical parsing from a binary stream."""
+        report = parser.parse_hierarchical_stream(io.BytesIO(valid_xml.encode("utf-8")))
+        expected = parser.parse_hierarchical(valid_xml)
+
+        assert report.root.name == expected.root.name
+        assert report.root.total_lines == expected.root.total_lines
+        assert report.root.covered_lines == expected.root.covered_lines
+
     def test_parse_empty_xml(self, parser: XMLCoverageParser, empty_xml: str) -> None:
         """Test parsing empty XML content."""
         report = parser.parse(empty_xml)
@@ -152,6 +190,7 @@ class TestXMLCoverageParser:
             ("1", 1),
             ("5", 1),
             ("100", 1),
+            ("123456789012345678901234567890", 1),
         ],
     )
     def test_parse_line_hits(self, parser: XMLCoverageParser, hits: str, expected_covered: int) -> None:
@@ -193,6 +232,13 @@ class TestXMLCoverageParser:
             assert isinstance(child, FileNode)
             assert child.name in ["module1.py", "module2.py"]
 
+    def test_parse_hierarchical_parses_once(self, parser: XMLCoverageParser, valid_xml: str) -> None:
+        """Test that hierarchical parsing does not go through the flat report."""
+        with patch.object(XMLCoverageParser, "parse", side_effect=AssertionError("flat parse used")):
+            hierarchical_report = parser.parse_hierarchical(valid_xml)
+
+        assert hierarchical_report.root.total_lines == 6
+
     def test_parse_hierarchical_empty(self, parser: XMLCoverageParser, empty_xml: str) -> None:
         """Test parsing empty XML into hierarchical structure."""
         hierarchical_report = parser.parse_hierarchical(empty_xml)
@@ -247,75 +293,81 @@ class TestXMLCoverageParser:
         assert subsubdir.name == "subsubdir"
         assert len(subsubdir.children) == 1  # module3.py
 
-    def test_find_common_root_empty(self, parser: XMLCoverageParser) -> None:
-        """Test finding common root with empty list."""
-        result = parser._find_common_root([])
-        assert result == ""
-
-    def test_find_common_root_single_file(self, parser: XMLCoverageParser) -> None:
-        """Test finding common root with single file."""
-        result = parser._find_common_root(["src/module.py"])
-        assert result == "src"
-
-    def test_find_common_root_no_common_path_at_start(self, parser: XMLCoverageParser) -> None:
-        """Test finding common root when files have no common path from the start."""
-        # This should ensure the `if not common_parts:` branch is covered
-        result = parser._find_common_root(["file1.py", "file2.py"])
-        assert result == ""
-
-        # Another case with different first level directories
-        result = parser._find_common_root(["apple/test.py", "banana/test.py"])
-        assert result == ""
-
-        # Edge case: files at root level (no directory parts)
-        # This should ensure min_parts=1 but paths have only 1 part, forcing loop to run with i=0
-        # and different first parts should make common_parts empty
-        result = parser._find_common_root(["a.py", "b.py", "c.py"])
-        assert result == ""
-
-    def test_find_common_root_empty_paths_edge_case(self, parser: XMLCoverageParser) -> None:
-        """Test edge case to ensure coverage of specific branch conditions."""
-        # Test case that should hit the specific branch: 167->177
-        # This creates a scenario where min_parts > 0, but first comparison fails
-        result = parser._find_common_root(["x.py", "y.py"])
-        assert result == ""
-
-        # Another edge case with very different first elements
-        result = parser._find_common_root(["aaaa.py", "bbbb.py"])
-        assert result == ""
-
-        # Edge case: Empty paths should make min_parts = 0, testing the direct path from for to if
-        result = parser._find_common_root(["", ""])
-        assert result == ""
+    def test_build_hierarchy_empty(self, parser: XMLCoverageParser) -> None:
+        """Test building hierarchy without files."""
+        root = parser._build_hierarchy([]).root
+        assert root.name == ""
+        assert root.path == ""
+        assert root.children == []
+
+    def test_build_hierarchy_single_file(self, parser: XMLCoverageParser) -> None:
+        """Test that a single file is rooted at its parent directory."""
+        root = parser._build_hierarchy([FileCoverage("src/module.py", 10, 5)]).root
+        assert root.name == "src"
+        assert root.path == "src"
+        assert [child.name for child in root.children] == ["module.py"]
+
+    def test_build_hierarchy_consumes_iterator(self, parser: XMLCoverageParser) -> None:
+        """Test that files can be streamed into the hierarchy builder."""
+        files = iter([FileCoverage("src/a.py", 10, 5), FileCoverage("src/b.py", 10, 10)])
+        root = parser._build_hierarchy(files).root
+        assert root.path == "src"
+        assert root.total_lines == 20
+        assert root.parent is None
+
+    def test_build_hierarchy_normalizes_cached_directories(self, parser: XMLCoverageParser) -> None:
+        """Test that files in an already seen directory and unnormalized paths share one node."""
+        files = [
+            FileCoverage("pkg/a.py", 10, 5),
+            FileCoverage("pkg/b.py", 10, 10),
+            FileCoverage(str(Path("pkg/sub/../c.py")), 10, 0),
+            FileCoverage("pkg/sub/d.py", 10, 0),
+        ]
+        root = parser._build_hierarchy(files).root
+        assert root.path == "pkg"
+        assert [child.name for child in root.children] == ["a.py", "b.py", "c.py", "sub"]
+        assert root.total_lines == 40
+
+    @pytest.mark.parametrize(
+        "filepaths",
+        [
+            ["file1.py", "file2.py"],
+            ["apple/test.py", "banana/test.py"],
+            ["a.py", "b.py", "c.py"],
+            ["src/module1.py", "tests/test1.py"],
+            ["/abs/path/file.py", "rel/path/other.py"],
+        ],
+    )
+    def test_build_hierarchy_no_common_root(self, parser: XMLCoverageParser, filepaths: list[str]) -> None:
+        """Test building hierarchy when files share no common directory."""
+        root = parser._build_hierarchy([FileCoverage(fp, 1, 1) for fp in filepaths]).root
+        assert root.name == "root"
+        assert root.path == ""
+        assert len(root.children) == len({Path(fp).parts[0] for fp in filepaths})
 
     @pytest.mark.parametrize(
         "filepaths,expected",
         [
             (["src/module1.py", "src/module2.py"], "src"),
             (["src/sub/module1.py", "src/sub/module2.py"], str(Path("src/sub"))),
-            (["src/module1.py", "tests/test1.py"], ""),
             (["a/b/c/d.py", "a/b/e/f.py"], str(Path("a/b"))),
             (["/abs/path/file.py", "/abs/path/other.py"], str(Path("/abs/path"))),
-            # Additional test cases for edge cases that might not be covered
-            (["module1.py", "module2.py"], ""),
-            (["a.py", "b.py"], ""),
-            (["foo/bar.py", "baz/qux.py"], ""),
+            (["src/module1.py", "src/sub/module2.py"], "src"),
         ],
     )
-    def test_find_common_root_multiple_files(
-        self, parser: XMLCoverageParser, filepaths: list[str], expected: str
-    ) -> None:
-        """Test finding common root with multiple files."""
-        result = parser._find_common_root(filepaths)
-        assert result == expected
+    def test_build_hierarchy_common_root(self, parser: XMLCoverageParser, filepaths: list[str], expected: str) -> None:
+        """Test that the root is the deepest directory shared by all files."""
+        root = parser._build_hierarchy([FileCoverage(fp, 1, 1) for fp in filepaths]).root
+        assert root.path == expected
+        assert root.name == Path(expected).name
 
     def test_add_file_to_tree(self, parser: XMLCoverageParser) -> None:
         """Test adding file to directory tree."""
         root = DirectoryNode(name="root", path="", children=[])
-        directory_map: dict[str, DirectoryNode] = {"": root}
+        directory_map: dict[tuple[str, ...], DirectoryNode] = {(): root}
         file_coverage = FileCoverage(filename="src/module.py", total_lines=10, covered_lines=8)
 
-        parser._add_file_to_tree(file_coverage, root, directory_map, "")
+        parser._add_file_to_tree(file_coverage, root, directory_map)
 
         # Check directory was created
         assert len(root.children) == 1
@@ -330,34 +382,28 @@ class TestXMLCoverageParser:
         assert file_node.name == "module.py"
         assert file_node.file_coverage == file_coverage
 
-    def test_add_file_to_tree_with_common_root(self, parser: XMLCoverageParser) -> None:
-        """Test adding file to tree with common root."""
-        root = DirectoryNode(name="project", path="project", children=[])
-        directory_map: dict[str, DirectoryNode] = {"project": root}
-        file_coverage = FileCoverage(filename="project/src/module.py", total_lines=10, covered_lines=8)
-
-        parser._add_file_to_tree(file_coverage, root, directory_map, "project")
-
-        # Check structure
-        assert len(root.children) == 1
-        src_dir = root.children[0]
-        assert isinstance(src_dir, DirectoryNode)  # Type narrowing for mypy
-        assert src_dir.name == "src"
-        assert len(src_dir.children) == 1
-        assert src_dir.children[0].name == "module.py"
+    def test_add_file_to_tree_reuses_directories(self, parser: XMLCoverageParser) -> None:
+        """Test that files in the same directory share one directory node."""
+        root = DirectoryNode(name="root", path="", children=[])
+        directory_map: dict[tuple[str, ...], DirectoryNode] = {(): root}
 
-    def test_add_file_to_tree_outside_common_root(self, parser: XMLCoverageParser) -> None:
-        """Test adding file outside common root."""
-        root = DirectoryNode(name="project", path="project", children=[])
-        directory_map: dict[str, DirectoryNode] = {"project": root}
-        file_coverage = FileCoverage(filename="other/module.py", total_lines=10, covered_lines=8)
+        parser._add_file_to_tree(FileCoverage("project/src/a.py", 10, 8), root, directory_map)
+        parser._add_file_to_tree(FileCoverage("project/src/b.py", 10, 8), root, directory_map)
 
-        parser._add_file_to_tree(file_coverage, root, directory_map, "project")
+        project_dir = root.children[0]
+        assert isinstance(project_dir, DirectoryNode)  # Type narrowing for mypy
+        assert len(project_dir.children) == 1
+        src_dir = project_dir.children[0]
+        assert isinstance(src_dir, DirectoryNode)
+        assert src_dir.path == str(Path("project/src"))
+        assert [child.name for child in src_dir.children] == ["a.py", "b.py"]
+        assert directory_map[("project", "src")] is src_dir
 
-        # File should be added with full path
-        assert len(root.children) == 1
-        other_dir = root.children[0]
-        assert other_dir.name == "other"
+    def test_split_path_absolute(self, parser: XMLCoverageParser) -> None:
+        """Test that absolute paths keep their anchor as the first component."""
+        parts = parser._split_path(str(Path("/abs/path/file.py").absolute()))
+        assert parts[-3:] == ["abs", "path", "file.py"]
+        assert str(Path(*parts)) == str(Path("/abs/path/file.py").absolute())
 
 
 class TestParseCoverageFile:
@@ -397,16 +443,12 @@ class TestParseCoverageFile:
         with pytest.raises(FileNotFoundError, match="Coverage file not found"):
             parse_coverage_file(coverage_file)
 
-    def test_parse_file_with_unicode_error(self, tmp_path: Path) -> None:
+    def test_parse_file_with_unicode_error(self, bad_encoding_file: Path) -> None:
         """Test parsing file with unicode error."""
-        # Create file with invalid encoding
-        coverage_file = tmp_path / "bad_encoding.xml"
-        coverage_file.write_bytes(b"\xff\xfe Invalid UTF-8")
-
         with pytest.raises(CoverageParseError) as exc_info:
-            parse_coverage_file(coverage_file)
+            parse_coverage_file(bad_encoding_file)
 
-        assert str(coverage_file) in str(exc_info.value)
+        assert str(bad_encoding_file) in str(exc_info.value)
 
 
 class TestCoverageParseError:
@@ -1,6 +1,8 @@
 """Unit tests for Plotly treemap layout module."""
 
-from unittest.mock import Mock
+import json
+import sys
+from types import SimpleNamespace
 
 import plotly.graph_objects as go  # type: ignore[import-untyped]
 import pytest
@@ -43,10 +45,23 @@ class TestTreemapData:
         assert data.colors[0] == 75.0
         assert data.text_info[0] == "test info"
 
+    def test_instances_do_not_share_lists(self) -> None:
+        """Test that each TreemapData gets its own lists."""
+        first = TreemapData()
+        first.ids.append("a")
+
+        assert TreemapData().ids == []
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots require Python 3.10+")
+    def test_uses_slots(self) -> None:
+        """Test that TreemapData carries no per-instance __dict__."""
+        assert not hasattr(TreemapData(), "__dict__")
+
 
 class TestPlotlyTreemapLayout:
     """Test PlotlyTreemapLayout class."""
 
+    # Layouts stay per-test because tests change their colorscale
     @pytest.fixture
     def layout(self) -> PlotlyTreemapLayout:
         """Create PlotlyTreemapLayout instance."""
@@ -57,7 +72,7 @@ class TestPlotlyTreemapLayout:
         """Create PlotlyTreemapLayout with custom colorscale."""
         return PlotlyTreemapLayout(colorscale="Viridis")
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def simple_hierarchical_report(self) -> HierarchicalCoverageReport:
         """Create simple hierarchical coverage report."""
         root = DirectoryNode(name="root", path="", children=[])
@@ -66,7 +81,7 @@ class TestPlotlyTreemapLayout:
         root.add_child(file_node)
         return HierarchicalCoverageReport(root=root)
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def complex_hierarchical_report(self) -> HierarchicalCoverageReport:
         """Create complex hierarchical coverage report."""
         # Root directory
@@ -91,7 +106,7 @@ class TestPlotlyTreemapLayout:
 
         return HierarchicalCoverageReport(root=root)
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def empty_hierarchical_report(self) -> HierarchicalCoverageReport:
         """Create empty hierarchical coverage report."""
         root = DirectoryNode(name="empty", path="", children=[])
@@ -174,22 +189,16 @@ class TestPlotlyTreemapLayout:
         assert len(treemap_data.ids) == 5
 
         # Check specific IDs - note the full path structure
-        expected_ids = ["src", "src/main.py", "src/utils", "src/utils/helper.py", "src/utils/config.py"]
-        for expected_id in expected_ids:
-            assert expected_id in treemap_data.ids
+        expected_ids = {"src", "src/main.py", "src/utils", "src/utils/helper.py", "src/utils/config.py"}
+        assert set(treemap_data.ids) == expected_ids
 
         # Check parent relationships
-        root_idx = treemap_data.ids.index("src")
-        assert treemap_data.parents[root_idx] == ""
-
-        main_idx = treemap_data.ids.index("src/main.py")
-        assert treemap_data.parents[main_idx] == "src"
-
-        utils_idx = treemap_data.ids.index("src/utils")
-        assert treemap_data.parents[utils_idx] == "src"
-
-        helper_idx = treemap_data.ids.index("src/utils/helper.py")
-        assert treemap_data.parents[helper_idx] == "src/utils"
+        parent_of = dict(zip(treemap_data.ids, treemap_data.parents))
+        assert parent_of["src"] == ""
+        assert parent_of["src/main.py"] == "src"
+        assert parent_of["src/utils"] == "src"
+        assert parent_of["src/utils/helper.py"] == "src/utils"
+        assert parent_of["src/utils/config.py"] == "src/utils"
 
     def test_generate_figure_empty_structure(
         self, layout: PlotlyTreemapLayout, empty_hierarchical_report: HierarchicalCoverageReport
@@ -204,6 +213,20 @@ class TestPlotlyTreemapLayout:
         assert treemap_data.ids[0] == "empty"
         assert treemap_data.parents[0] == ""
 
+    def test_generate_figure_reflects_report_changes(self, layout: PlotlyTreemapLayout) -> None:
+        """Test that rendering a report again after add_child shows the new node."""
+        root = DirectoryNode(name="src", path="src", children=[])
+        root.add_child(FileNode("a.py", "src/a.py", FileCoverage("src/a.py", 10, 5)))
+        report = HierarchicalCoverageReport(root=root)
+
+        first = layout.generate_figure(report)
+        root.add_child(FileNode("b.py", "src/b.py", FileCoverage("src/b.py", 10, 10)))
+        second = layout.generate_figure(report)
+
+        assert first.data[0].ids == ("src", "src/a.py")
+        assert second.data[0].ids == ("src", "src/a.py", "src/b.py")
+        assert second.data[0].values[0] == 20
+
     def test_prepare_treemap_data(
         self, layout: PlotlyTreemapLayout, simple_hierarchical_report: HierarchicalCoverageReport
     ) -> None:
@@ -258,66 +281,28 @@ class TestPlotlyTreemapLayout:
         assert "Coverage: 75.0%" in data.text_info[dir_idx]
 
     def test_add_node_directory_node_empty(self, layout: PlotlyTreemapLayout) -> None:
-        """Test _add_node with empty DirectoryNode."""
+        """Test _add_node with an empty DirectoryNode takes the zero-lines branch."""
         data = TreemapData()
         directory = DirectoryNode(name="empty", path="empty", children=[])
-
-        layout._add_node(directory, data)
-
-        assert len(data.ids) == 1
-        assert data.ids[0] == "empty"
-        assert data.values[0] == 1  # Default value for empty directory
-        assert data.colors[0] == 0  # Default color for empty directory
-        assert data.text_info[0] == "empty<br>Directory"
-
-    def test_add_node_directory_node_empty_coverage_check(self, layout: PlotlyTreemapLayout) -> None:
-        """Test _add_node with empty DirectoryNode to ensure coverage of empty directory branch."""
-        data = TreemapData()
-        # Create explicitly empty directory with no children
-        directory = DirectoryNode(name="empty_dir", path="empty_dir", children=[])
-
-        # Verify the directory has no total lines
         assert directory.total_lines == 0
 
         layout._add_node(directory, data)
 
-        # Verify the empty directory branch is taken
-        assert len(data.ids) == 1
-        assert data.ids[0] == "empty_dir"
+        assert data.ids == ["empty"]
         assert data.values[0] == 1  # PlotlyConfig.EMPTY_DIRECTORY_VALUE
         assert data.colors[0] == 0  # PlotlyConfig.EMPTY_DIRECTORY_COLOR
-        assert data.text_info[0] == "empty_dir<br>Directory"
-
-    def test_add_node_directory_node_zero_lines_explicit(self, layout: PlotlyTreemapLayout) -> None:
-        """Test _add_node with DirectoryNode that explicitly has zero total_lines."""
-        data = TreemapData()
-        # Create an empty directory that should have total_lines = 0
-        directory = DirectoryNode(name="zero_lines", path="zero_lines", children=[])
-
-        # Ensure this directory has no children and therefore total_lines = 0
-        assert len(directory.children) == 0
-        assert directory.total_lines == 0
-
-        layout._add_node(directory, data)
-
-        # Check that the else branch (node.total_lines == 0) was taken
-        assert len(data.ids) == 1
-        assert data.ids[0] == "zero_lines"
-        assert data.values[0] == 1  # PlotlyConfig.EMPTY_DIRECTORY_VALUE
-        assert data.colors[0] == 0  # PlotlyConfig.EMPTY_DIRECTORY_COLOR
-        assert data.text_info[0] == "zero_lines<br>Directory"
+        assert data.text_info[0] == "empty<br>Directory"
 
     def test_add_node_with_invalid_node_type(self, layout: PlotlyTreemapLayout) -> None:
         """Test _add_node with node that is neither FileNode nor DirectoryNode."""
 
         data = TreemapData()
-        # Create a mock object that is neither FileNode nor DirectoryNode
-        invalid_node = Mock()
-        invalid_node.name = "invalid"
+        # Create an object that is neither FileNode nor DirectoryNode
+        invalid_node = SimpleNamespace(name="invalid")
 
         # This should test the case where neither isinstance condition is true
         # and the function should exit without doing anything
-        layout._add_node(invalid_node, data)
+        layout._add_node(invalid_node, data)  # type: ignore[arg-type]
 
         # Basic data should be added but no type-specific values/colors/text_info
         assert len(data.ids) == 1
@@ -332,6 +317,26 @@ class TestPlotlyTreemapLayout:
         assert len(data.colors) == 0
         assert len(data.text_info) == 0
 
+    def test_add_node_deep_tree(self, layout: PlotlyTreemapLayout) -> None:
+        """Test that trees deeper than the recursion limit can be added."""
+        depth = sys.getrecursionlimit() + 100
+        root = DirectoryNode(name="root", path="", children=[])
+        current = root
+        for level in range(depth):
+            child = DirectoryNode(name=f"d{level}", path=f"d{level}", children=[])
+            current.add_child(child)
+            current = child
+        current.add_child(FileNode("leaf.py", "leaf.py", FileCoverage("leaf.py", 2, 1)))
+
+        data = TreemapData()
+        layout._add_node(root, data)
+
+        assert len(data.ids) == depth + 2
+        assert data.ids[0] == "root"
+        assert data.parents[1] == "root"
+        assert data.ids[2] == "d0/d1"
+        assert data.ids[-1].endswith(f"/d{depth - 1}/leaf.py")
+
     def test_add_node_with_parent_id(self, layout: PlotlyTreemapLayout) -> None:
         """Test _add_node with parent ID."""
         data = TreemapData()
@@ -342,15 +347,15 @@ class TestPlotlyTreemapLayout:
 
         assert data.parents[0] == "parent"
 
-    def test_add_node_with_path_parts(self, layout: PlotlyTreemapLayout) -> None:
-        """Test _add_node with path parts."""
+    def test_add_node_with_parent_path(self, layout: PlotlyTreemapLayout) -> None:
+        """Test _add_node with parent path."""
         data = TreemapData()
         file_coverage = FileCoverage(filename="test.py", total_lines=10, covered_lines=8)
         file_node = FileNode(name="test.py", path="test.py", file_coverage=file_coverage)
 
-        layout._add_node(file_node, data, path_parts=["src", "subdir"])
+        layout._add_node(file_node, data, parent_path="src/subdir")
 
-        # ID should include path parts
+        # ID should include the parent path
         assert data.ids[0] == "src/subdir/test.py"
 
     def test_add_node_root_special_case(self, layout: PlotlyTreemapLayout) -> None:
@@ -359,10 +364,12 @@ class TestPlotlyTreemapLayout:
         file_coverage = FileCoverage(filename="test.py", total_lines=10, covered_lines=8)
         file_node = FileNode(name="test.py", path="test.py", file_coverage=file_coverage)
 
-        layout._add_node(file_node, data, path_parts=["root"])
+        root = DirectoryNode(name="root", path="", children=[file_node])
 
-        # ID should be just the filename when path starts with "root"
-        assert data.ids[0] == "test.py"
+        layout._add_node(root, data)
+
+        # Top-level "root" node keeps its ID but is left out of its children's IDs
+        assert data.ids == ["root", "test.py"]
 
     @pytest.mark.parametrize(
         "width,height",
@@ -402,6 +409,31 @@ class TestPlotlyTreemapLayout:
         assert figure.layout.margin.r == 20
         assert figure.layout.font.size == 12
 
+    def test_generate_figure_matches_validated_figure(
+        self, custom_layout: PlotlyTreemapLayout, complex_hierarchical_report: HierarchicalCoverageReport
+    ) -> None:
+        """Test that the unvalidated figure is identical to one Plotly validates."""
+        figure = custom_layout.generate_figure(complex_hierarchical_report)
+
+        validated = go.Figure(figure.to_dict())
+
+        assert json.loads(figure.to_json()) == json.loads(validated.to_json())
+        # The named colorscale is resolved to explicit colors, which plotly.js requires
+        assert isinstance(figure.data[0].marker.colorscale, tuple)
+
+    def test_figures_do_not_share_layout_settings(
+        self, layout: PlotlyTreemapLayout, simple_hierarchical_report: HierarchicalCoverageReport
+    ) -> None:
+        """Test that editing one figure does not leak into figures generated later."""
+        first = layout.generate_figure(simple_hierarchical_report)
+        first.layout.margin.t = 5
+        first.data[0].tiling.pad = 9
+
+        second = layout.generate_figure(simple_hierarchical_report)
+
+        assert second.layout.margin.t == 60
+        assert second.data[0].tiling.pad == 2
+
     def test_treemap_properties(
         self, layout: PlotlyTreemapLayout, simple_hierarchical_report: HierarchicalCoverageReport
     ) -> None:
@@ -475,26 +507,25 @@ class TestPlotlyTreemapLayout:
         file_coverage = FileCoverage(filename="test.py", total_lines=10, covered_lines=8)
         file_node = FileNode(name="test.py", path="test.py", file_coverage=file_coverage)
 
-        # Add with different path parts
-        layout._add_node(file_node, data, path_parts=["a", "b", "c"])
+        # Add with a nested parent path
+        layout._add_node(file_node, data, parent_path="a/b/c")
 
         assert data.ids[0] == "a/b/c/test.py"
 
     def test_root_name_handling(self, layout: PlotlyTreemapLayout) -> None:
-        """Test proper handling of 'root' in path parts."""
+        """Test proper handling of 'root' in parent paths."""
         data = TreemapData()
 
         file_coverage = FileCoverage(filename="test.py", total_lines=10, covered_lines=8)
         file_node = FileNode(name="test.py", path="test.py", file_coverage=file_coverage)
 
-        # Test root handling
-        layout._add_node(file_node, data, path_parts=["root", "src"])
+        # Parent paths are already stripped of the top-level "root"
+        layout._add_node(file_node, data, parent_path="src")
 
-        # When path starts with "root", it should be stripped
         assert data.ids[0] == "src/test.py"
 
-        # Test edge case: only root
+        # Test edge case: directly below root
         data2 = TreemapData()
-        layout._add_node(file_node, data2, path_parts=["root"])
-        # When only root, it still creates the filename
+        layout._add_node(file_node, data2)
+        # Directly below root, the ID is just the filename
         assert data2.ids[0] == "test.py"